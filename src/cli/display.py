@@ -72,35 +72,73 @@ def enrich_dcf_with_monte_carlo(engine: "DCFEngine", result: dict) -> dict:
     """Enrich DCF result with Monte Carlo, Reverse DCF, and Conviction Rating."""
     import numpy as np
     
-    enriched = result.copy()
-
-    # Monte Carlo simulation
     try:
         np.random.seed(config.MONTE_CARLO_SEED)
         mc_result = engine.simulate_value(iterations=config.MONTE_CARLO_ITERATIONS)
+    except Exception:
+        mc_result = None
 
-        if "error" not in mc_result:
-            enriched['monte_carlo'] = {
-                'probability': mc_result['prob_undervalued'],
-                'var_95': mc_result['var_95'],
-                'upside_95': mc_result['upside_95'],
-                'median_value': mc_result['median_value'],
-                'iterations': mc_result['iterations']
-            }
+    return _enrich_dcf(engine, result, mc_result)
 
-            # Conviction rating
-            conviction, color, emoji = calculate_conviction_rating(
-                result['upside_downside'],
-                mc_result['prob_undervalued']
-            )
-            enriched['conviction'] = {
-                'label': conviction,
-                'color': color,
-                'emoji': emoji
-            }
+
+def enrich_dcf_batch(engines: list["DCFEngine"], results: dict[str, dict]) -> dict[str, dict]:
+    """Enrich several DCF results at once.
+    
+    Same output per ticker as enrich_dcf_with_monte_carlo(), but the Monte
+    Carlo draws of all companies are valued in a single vectorized pass
+    (DCFEngine.simulate_value_batch).
+    
+    Args:
+        engines: Engines with company data loaded
+        results: get_intrinsic_value() results keyed by ticker; engines
+            without a result are skipped
+    
+    Returns:
+        Enriched results keyed by ticker
+    """
+    from src.dcf_engine import DCFEngine
+    
+    engines = [engine for engine in engines if engine.ticker in results]
+    try:
+        mc_results = DCFEngine.simulate_value_batch(
+            engines, iterations=config.MONTE_CARLO_ITERATIONS, seed=config.MONTE_CARLO_SEED
+        )
     except Exception:
+        mc_results = {}
+
+    return {
+        engine.ticker: _enrich_dcf(engine, results[engine.ticker], mc_results.get(engine.ticker))
+        for engine in engines
+    }
+
+
+def _enrich_dcf(engine: "DCFEngine", result: dict, mc_result: dict | None) -> dict:
+    """Attach Monte Carlo, conviction and reverse DCF to a copy of result (mc_result None = simulation failed)."""
+    enriched = result.copy()
+
+    # Monte Carlo simulation
+    if mc_result is None:
         enriched['monte_carlo'] = None
         enriched['conviction'] = {'label': 'N/A', 'color': 'dim', 'emoji': '⚪'}
+    elif "error" not in mc_result:
+        enriched['monte_carlo'] = {
+            'probability': mc_result['prob_undervalued'],
+            'var_95': mc_result['var_95'],
+            'upside_95': mc_result['upside_95'],
+            'median_value': mc_result['median_value'],
+            'iterations': mc_result['iterations']
+        }
+
+        # Conviction rating
+        conviction, color, emoji = calculate_conviction_rating(
+            result['upside_downside'],
+            mc_result['prob_undervalued']
+        )
+        enriched['conviction'] = {
+            'label': conviction,
+            'color': color,
+            'emoji': emoji
+        }
 
     # Reverse DCF
     try:
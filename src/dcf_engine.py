@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
@@ -14,6 +15,9 @@ from src.exceptions import CalculationError, DataFetchError, InsufficientDataErr
 from src.logging_config import get_logger
 from src.utils import default_cache, rate_limiter
 
+if TYPE_CHECKING:
+    from src.external.fred import MacroData
+
 logger = get_logger(__name__)
 
 
@@ -54,6 +58,46 @@ class CompanyData:
         }
 
 
+def _mc_dcf_values(fcf0: float | np.ndarray, shares: float | np.ndarray, growth: np.ndarray,
+                   term_growth: np.ndarray, wacc: np.ndarray, exit_mult: np.ndarray, years: int,
+                   use_exit: bool | np.ndarray, max_terminal_pct: float) -> np.ndarray:
+    """Per-share DCF values for a batch of Monte Carlo draws.
+    
+    Vectorized DCFEngine.calculate_dcf() (including the terminal value cap);
+    draws calculate_dcf() would reject come back as NaN. fcf0, shares and
+    use_exit may be per-draw arrays, so several companies' draws can be
+    valued together; exit_mult is only read where use_exit is set.
+    """
+    pv_explicit = np.zeros_like(growth)
+    fcf = fcf0 * np.ones_like(growth)
+    for t in range(1, years + 1):
+        fcf = fcf * (1 + growth)
+        pv_explicit += fcf / ((1 + wacc) ** t)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        term_value = np.where(use_exit, fcf * exit_mult, fcf * (1 + term_growth) / (wacc - term_growth))
+        term_pv = term_value / ((1 + wacc) ** years)
+        total = pv_explicit + term_pv
+        terminal_pct = np.where(total > 0, term_pv / total, 0.0)
+        term_pv = np.where(terminal_pct > max_terminal_pct,
+                           pv_explicit * max_terminal_pct / (1 - max_terminal_pct), term_pv)
+        values = np.where(shares > 0, (pv_explicit + term_pv) / shares, 0.0)
+    
+    valid = (growth >= -0.50) & (growth <= 1.0) & (wacc > 0) & (wacc <= 0.50)
+    valid &= use_exit | (wacc > term_growth)
+    return np.where(valid, values, np.nan)
+
+
+def _validate_forecast_years(years: int, ticker: str | None = None) -> None:
+    """Raise ValidationError unless 1 <= years <= 20 (shared by the scalar and vectorized DCF)."""
+    if years < 1 or years > 20:
+        raise ValidationError(
+            f"Forecast years {years} outside valid range (1 to 20)",
+            ticker=ticker,
+            details={"years": years, "min": 1, "max": 20}
+        )
+
+
 class DCFEngine:
     """Discounted Cash Flow valuation engine."""
 
@@ -67,6 +111,9 @@ class DCFEngine:
     # Terminal value constraints (diagnostic-driven)
     MAX_TERMINAL_VALUE_PCT: float = 0.65  # Terminal value should not exceed 65% of EV
     
+    # Monte Carlo iteration modes (based on convergence analysis)
+    MC_ITERATION_MODES: dict = {'fast': 2000, 'default': 5000, 'detailed': 10000}
+    
     # Sector-specific constraints (from diagnostic analysis)
     SECTOR_MAX_GROWTH: dict = {
         "Financial Services": 0.10,  # Banks don't grow >10% sustainably
@@ -97,10 +144,21 @@ class DCFEngine:
         "Technology": 0.028,  # GDP + secular growth
     }
 
-    def __init__(self, ticker: str, auto_fetch: bool = True):
+    def __init__(self, ticker: str, auto_fetch: bool = True,
+                 macro_data: MacroData | None = None, cape_data: dict | None = None):
+        """Initialize DCF engine.
+
+        Args:
+            ticker: Stock ticker symbol
+            auto_fetch: Fetch company data immediately
+            macro_data: Pre-fetched FRED data used for WACC instead of the connector
+            cape_data: Pre-fetched get_equity_risk_scalar() result used for WACC
+        """
         self.ticker = ticker.upper().strip()
         self._company_data: CompanyData | None = None
         self._last_error: str | None = None
+        self._macro_data = macro_data
+        self._cape_data = cape_data
         if auto_fetch:
             self.fetch_data()
 
@@ -328,12 +386,7 @@ class DCFEngine:
             )
         
         # Validate years
-        if years < 1 or years > 20:
-            raise ValidationError(
-                f"Forecast years {years} outside valid range (1 to 20)",
-                ticker=ticker,
-                details={"years": years, "min": 1, "max": 20}
-            )
+        _validate_forecast_years(years, ticker)
 
         pv_explicit, fcf = 0.0, fcf0
         cash_flows = []
@@ -406,6 +459,20 @@ class DCFEngine:
 
         return cash_flows, pv_explicit, term_pv, pv_explicit + term_pv, terminal_info
 
+    def _get_macro_data(self) -> MacroData:
+        """Injected macro data, else the shared FRED connector's."""
+        if self._macro_data is not None:
+            return self._macro_data
+        from src.external.fred import get_fred_connector
+        return get_fred_connector().get_macro_data()
+
+    def _get_cape_data(self) -> dict:
+        """Injected CAPE risk scalar, else get_equity_risk_scalar()."""
+        if self._cape_data is not None:
+            return self._cape_data
+        from src.external.shiller import get_equity_risk_scalar
+        return get_equity_risk_scalar()
+
     def calculate_wacc(self, beta: float | None = None, 
                       use_dynamic_rf: bool = True,
                       use_cape_adjustment: bool = True) -> float:
@@ -425,9 +492,7 @@ class DCFEngine:
         # Get base risk-free rate from FRED (authoritative source)
         if use_dynamic_rf:
             try:
-                from src.external.fred import get_fred_connector
-                fred = get_fred_connector()
-                macro_data = fred.get_macro_data()
+                macro_data = self._get_macro_data()
                 rf_rate = macro_data.risk_free_rate
             except Exception as e:
                 print(f"⚠️  FRED error: {e}. Using static rate.")
@@ -441,8 +506,7 @@ class DCFEngine:
         # Apply true Shiller CAPE macro adjustment if enabled
         if use_cape_adjustment:
             try:
-                from src.external.shiller import get_equity_risk_scalar
-                cape_data = get_equity_risk_scalar()
+                cape_data = self._get_cape_data()
                 # Convert CAPE scalar to WACC adjustment
                 # CAPE scalar affects expected returns, which inversely affects discount rate
                 # If CAPE is expensive (scalar < 1.0), increase WACC
@@ -474,9 +538,7 @@ class DCFEngine:
         # Get risk-free rate with source (from FRED API)
         if use_dynamic_rf:
             try:
-                from src.external.fred import get_fred_connector
-                fred = get_fred_connector()
-                macro_data = fred.get_macro_data()
+                macro_data = self._get_macro_data()
                 rf_rate = macro_data.risk_free_rate
                 rf_source = f"FRED (10Y Treasury): {rf_rate*100:.2f}%"
                 if macro_data.inflation_rate:
@@ -499,8 +561,7 @@ class DCFEngine:
         cape_info = None
         if use_cape_adjustment:
             try:
-                from src.external.shiller import get_equity_risk_scalar
-                cape_data = get_equity_risk_scalar()
+                cape_data = self._get_cape_data()
                 # Convert CAPE scalar to WACC adjustment
                 cape_adjustment = (1.0 - cape_data['risk_scalar']) * base_wacc * 0.5
                 cape_info = {
@@ -928,27 +989,42 @@ class DCFEngine:
             # Use EV/Sales relative valuation for loss-making companies
             return self.calculate_ev_sales_valuation()
 
-        # Use DCF for profitable companies
-        # Clean growth rate using Bayesian prior if user didn't provide explicit value
-        if growth is None:
-            cleaned_growth, cleaning_msg = self.clean_growth_rate(data.analyst_growth, data.sector)
-            growth = cleaned_growth
-            # Store cleaning message for display
-            growth_cleaning = cleaning_msg
-        else:
-            growth_cleaning = None
+        # Start the peer-multiple fetch now so it overlaps the growth/WACC lookups below
+        # (only when analyze() will compare a multiple against the sector)
+        from src.relative_valuation import (
+            RelativeValuationEngine,
+            calculate_implied_fair_value,
+        )
+        
+        has_multiples = any(m is not None and m > 0 for m in (data.forward_pe, data.pb_ratio, data.ev_ebitda))
+        rel_engine = RelativeValuationEngine(self.ticker, data.sector, prefetch_peers=has_multiples)
 
-        wacc = wacc if wacc is not None else self.calculate_wacc(data.beta)
+        try:
+            # Use DCF for profitable companies
+            # Clean growth rate using Bayesian prior if user didn't provide explicit value
+            if growth is None:
+                cleaned_growth, cleaning_msg = self.clean_growth_rate(data.analyst_growth, data.sector)
+                growth = cleaned_growth
+                # Store cleaning message for display
+                growth_cleaning = cleaning_msg
+            else:
+                growth_cleaning = None
 
-        # Smart default: Use exit multiple for high-growth/tech, Gordon Growth for mature
-        if terminal_method is None:
-            high_growth_sectors = {"Technology", "Communication Services", "Healthcare"}
-            is_high_growth = growth > 0.10 or data.sector in high_growth_sectors
-            terminal_method = "exit_multiple" if is_high_growth else "gordon_growth"
+            wacc = wacc if wacc is not None else self.calculate_wacc(data.beta)
 
-        cash_flows, pv_explicit, term_pv, ev, terminal_info = self.calculate_dcf(
-            data.fcf, growth, term_growth, wacc, years, terminal_method, exit_multiple
-        )
+            # Smart default: Use exit multiple for high-growth/tech, Gordon Growth for mature
+            if terminal_method is None:
+                high_growth_sectors = {"Technology", "Communication Services", "Healthcare"}
+                is_high_growth = growth > 0.10 or data.sector in high_growth_sectors
+                terminal_method = "exit_multiple" if is_high_growth else "gordon_growth"
+
+            cash_flows, pv_explicit, term_pv, ev, terminal_info = self.calculate_dcf(
+                data.fcf, growth, term_growth, wacc, years, terminal_method, exit_multiple
+            )
+        except Exception:
+            # The peer multiples won't be used; don't spend fetches on them
+            rel_engine.cancel_prefetch()
+            raise
 
         # Ensure value per share is never negative (mathematical floor)
         value_per_share = max(0.01, ev / data.shares if data.shares > 0 else 0.01)
@@ -963,12 +1039,6 @@ class DCFEngine:
             assessment = "FAIRLY VALUED"
         
         # Calculate relative valuation metrics for triangulation
-        from src.relative_valuation import (
-            RelativeValuationEngine,
-            calculate_implied_fair_value,
-        )
-        
-        rel_engine = RelativeValuationEngine(self.ticker, data.sector)
         relative_metrics = rel_engine.analyze(
             forward_pe=data.forward_pe,
             trailing_pe=data.trailing_pe,
@@ -1201,25 +1271,85 @@ class DCFEngine:
 
         Returns:
             dict with median, VaR, upside, probability metrics
+
+        Raises:
+            ValidationError: DCF path with years outside 1 to 20
         """
-        # Map mode to iterations
-        iteration_modes = {
-            'fast': 2000,
-            'default': 5000,
-            'detailed': 10000
-        }
-        if mode in iteration_modes:
-            iterations = iteration_modes[mode]
+        iterations = self.MC_ITERATION_MODES.get(mode, iterations)
         
         if not self.is_ready:
             return {"error": f"No data for {self.ticker}: {self._last_error}"}
 
-        data = self._company_data
-
         # Route to appropriate Monte Carlo method
-        if data.fcf <= 0:
+        if self._company_data.fcf <= 0:
             return self._simulate_ev_sales_value(iterations)
 
+        _validate_forecast_years(years, self.ticker)
+        draws = self._draw_dcf_scenarios(iterations, growth, wacc, term_growth, terminal_method, exit_multiple)
+        values = _mc_dcf_values(
+            float(self._company_data.fcf), float(self._company_data.shares), draws['growth'],
+            draws['term_growth'], draws['wacc'], draws['exit_mult'], years, draws['use_exit'],
+            self.MAX_TERMINAL_VALUE_PCT
+        )
+        return self._summarize_dcf_simulation(values, iterations, mode, draws)
+
+    @staticmethod
+    def simulate_value_batch(engines: list[DCFEngine], iterations: int = 5000, years: int = 5,
+                             mode: str = 'default', seed: int | None = None) -> dict[str, dict]:
+        """Monte Carlo simulation for several companies in one vectorized pass.
+
+        Gives the same result per engine as simulate_value(iterations,
+        years=years, mode=mode) with otherwise default parameters, each
+        preceded by np.random.seed(seed) when a seed is given. Draws are made
+        per company, then every company's draws are valued by a single
+        _mc_dcf_values() call. EV/Sales companies and
+        engines without data go through simulate_value().
+
+        Args:
+            engines: Engines to simulate (keyed by ticker in the result)
+            iterations: Number of Monte Carlo runs per company (or use mode)
+            years: Forecast years
+            mode: 'fast', 'default', or 'detailed' (overrides iterations)
+            seed: Reseed np.random with this before each company's draws
+
+        Returns:
+            Dict mapping ticker to simulate_value() output, in input order
+        """
+        iterations = DCFEngine.MC_ITERATION_MODES.get(mode, iterations)
+        results: dict[str, dict] = {}
+        batch = []
+        for engine in engines:
+            if seed is not None:
+                np.random.seed(seed)
+            if not engine.is_ready or engine.company_data.fcf <= 0:
+                results[engine.ticker] = engine.simulate_value(iterations, years=years, mode=mode)
+            else:
+                batch.append((engine, engine._draw_dcf_scenarios(iterations)))
+
+        if batch:
+            _validate_forecast_years(years)
+            sizes = [iterations] * len(batch)
+            values = _mc_dcf_values(
+                np.repeat([float(engine.company_data.fcf) for engine, _ in batch], sizes),
+                np.repeat([float(engine.company_data.shares) for engine, _ in batch], sizes),
+                *(np.concatenate([draws[key] for _, draws in batch])
+                  for key in ('growth', 'term_growth', 'wacc', 'exit_mult')),
+                years,
+                np.repeat([draws['use_exit'] for _, draws in batch], sizes),
+                DCFEngine.MAX_TERMINAL_VALUE_PCT,
+            )
+            for (engine, draws), company_values in zip(batch, np.split(values, len(batch)), strict=True):
+                results[engine.ticker] = engine._summarize_dcf_simulation(company_values, iterations, mode, draws)
+
+        return {engine.ticker: results[engine.ticker] for engine in engines}
+
+    def _draw_dcf_scenarios(self, iterations: int, growth: float | None = None,
+                            wacc: float | None = None, term_growth: float | None = None,
+                            terminal_method: str | None = None,
+                            exit_multiple: float | None = None) -> dict:
+        """Resolve base parameters and draw every Monte Carlo input for simulate_value()."""
+        data = self._company_data
+
         # Set base parameters
         if growth is None:
             growth = data.analyst_growth or 0.05
@@ -1263,54 +1393,58 @@ class DCFEngine:
             }
         }
         
-        # Run Monte Carlo simulations with scenario sampling
-        values = []
-        scenario_samples = {'bear': 0, 'base': 0, 'bull': 0}
-
-        for _ in range(iterations):
-            # Sample scenario based on probabilities
-            scenario_name = np.random.choice(
-                list(scenarios.keys()),
-                p=[s['probability'] for s in scenarios.values()]
-            )
-            scenario_samples[scenario_name] += 1
-            scenario = scenarios[scenario_name]
-            
-            # Calculate scenario-specific growth with noise
-            scenario_growth = growth * scenario['growth_multiplier']
-            # Add noise: tighter distribution within each scenario (±3% instead of ±5%)
-            sim_growth = np.random.normal(loc=scenario_growth, scale=0.03)
-            sim_term_growth = scenario['terminal_growth']
-            
-            # WACC variation (±1%)
-            sim_wacc = np.random.normal(loc=wacc, scale=0.01)
-
-            # Bound to reasonable ranges
-            sim_growth = np.clip(sim_growth, -0.30, 0.50)  # Tighter bounds
-            sim_term_growth = np.clip(sim_term_growth, 0.015, 0.035)
-            sim_wacc = max(sim_wacc, 0.03)  # Minimum 3% WACC
-
-            # Stochastic exit multiple if using exit multiple method
-            if terminal_method == "exit_multiple":
-                sim_exit_mult = np.random.uniform(low=exit_multiple*0.8, high=exit_multiple*1.2)
-            else:
-                sim_exit_mult = None
+        # Scenario sampling: draw every input up front so all iterations can
+        # be valued in one vectorized pass
+        names = list(scenarios.keys())
+        picks = np.random.choice(len(names), size=iterations, p=[s['probability'] for s in scenarios.values()])
+        counts = np.bincount(picks, minlength=len(names))
+        scenario_samples = {name: int(counts[i]) for i, name in enumerate(names)}
+        
+        # Scenario-specific growth with noise: tighter distribution within each scenario (±3% instead of ±5%)
+        growth_mult = np.array([s['growth_multiplier'] for s in scenarios.values()])[picks]
+        sim_growth = np.random.normal(loc=growth * growth_mult, scale=0.03)
+        sim_term_growth = np.array([s['terminal_growth'] for s in scenarios.values()])[picks]
+        
+        # WACC variation (±1%)
+        sim_wacc = np.random.normal(loc=wacc, scale=0.01, size=iterations)
+        
+        # Bound to reasonable ranges
+        sim_growth = np.clip(sim_growth, -0.30, 0.50)  # Tighter bounds
+        sim_term_growth = np.clip(sim_term_growth, 0.015, 0.035)
+        sim_wacc = np.maximum(sim_wacc, 0.03)  # Minimum 3% WACC
+        
+        # Stochastic exit multiple if using exit multiple method
+        use_exit = terminal_method == "exit_multiple"
+        if use_exit:
+            sim_exit_mult = np.random.uniform(low=exit_multiple*0.8, high=exit_multiple*1.2, size=iterations)
+        else:
+            sim_exit_mult = np.full(iterations, np.nan)
+        
+        return {
+            "growth": sim_growth,
+            "term_growth": sim_term_growth,
+            "wacc": sim_wacc,
+            "exit_mult": sim_exit_mult,
+            "use_exit": use_exit,
+            "scenarios": scenarios,
+            "scenario_samples": scenario_samples,
+            "base_params": {
+                "growth": growth,
+                "term_growth": term_growth,
+                "wacc": wacc,
+                "terminal_method": terminal_method,
+            },
+        }
 
-            try:
-                _, _, _, ev, _ = self.calculate_dcf(
-                    data.fcf, sim_growth, sim_term_growth, sim_wacc, years,
-                    terminal_method, sim_exit_mult
-                )
-                value_per_share = ev / data.shares if data.shares > 0 else 0
-                values.append(value_per_share)
-            except (ValueError, ZeroDivisionError):
-                continue  # Skip failed iterations
+    def _summarize_dcf_simulation(self, values: np.ndarray, iterations: int, mode: str, draws: dict) -> dict:
+        """Statistics and assessment for the per-share values of one simulation."""
+        data = self._company_data
+        values = values[~np.isnan(values)]  # Skip draws calculate_dcf() would reject
 
-        if not values:
+        if not values.size:
             return {"error": "All Monte Carlo iterations failed"}
 
         # Calculate statistics
-        values = np.array(values)
         median_value = np.median(values)
         mean_value = np.mean(values)
         std_value = np.std(values)
@@ -1338,7 +1472,7 @@ class DCFEngine:
         return {
             "ticker": self.ticker,
             "iterations": len(values),
-            "iteration_mode": mode if mode in iteration_modes else 'custom',
+            "iteration_mode": mode if mode in self.MC_ITERATION_MODES else 'custom',
             "current_price": data.current_price,
             "median_value": median_value,
             "mean_value": mean_value,
@@ -1350,17 +1484,12 @@ class DCFEngine:
             "prob_overvalued": prob_overvalued,
             "assessment": assessment,
             "scenario_sampling": {
-                "bear_samples": scenario_samples['bear'],
-                "base_samples": scenario_samples['base'],
-                "bull_samples": scenario_samples['bull'],
-                "scenarios": {name: s['description'] for name, s in scenarios.items()}
-            },
-            "base_params": {
-                "growth": growth,
-                "term_growth": term_growth,
-                "wacc": wacc,
-                "terminal_method": terminal_method,
+                "bear_samples": draws['scenario_samples']['bear'],
+                "base_samples": draws['scenario_samples']['base'],
+                "bull_samples": draws['scenario_samples']['bull'],
+                "scenarios": {name: s['description'] for name, s in draws['scenarios'].items()}
             },
+            "base_params": draws['base_params'],
             "distribution": values.tolist() if iterations <= 1000 else None,  # Only save for small runs
         }
 
@@ -1657,10 +1786,18 @@ class DCFEngine:
                 return engine.company_data
             return None
         
+        completed = 0
+        
+        def report(ticker: str, succeeded: bool) -> None:
+            nonlocal completed
+            completed += 1
+            print(f"  [{completed}/{len(tickers)}] {'✅' if succeeded else '❌'} {ticker}")
+        
         results = parallel_fetcher.fetch_batch_with_retry(
             tickers,
             fetch_single,
-            desc="Company data"
+            desc="Company data",
+            progress_callback=report if show_progress else None,
         )
         
         # Filter out failed fetches and report
@@ -1670,6 +1807,34 @@ class DCFEngine:
         
         return results
 
+    @staticmethod
+    def fetch_batch_info(tickers: list[str]) -> dict[str, dict | None]:
+        """
+        Fetch raw yfinance info for multiple tickers in parallel.
+        
+        Lighter than fetch_batch_data(): skips the cash flow statement, so it
+        suits callers that only need quote-level fields such as valuation
+        multiples. Shares the info cache with fetch_data().
+        
+        Args:
+            tickers: List of ticker symbols
+            
+        Returns:
+            Dict mapping tickers to info dicts (None if failed)
+        """
+        from src.utils import parallel_fetcher
+        
+        @rate_limiter
+        def fetch_single(ticker: str) -> dict | None:
+            """Fetch info for a single ticker."""
+            return DCFEngine(ticker, auto_fetch=False)._get_ticker_info(ticker.upper().strip())
+        
+        return parallel_fetcher.fetch_batch_with_retry(
+            tickers,
+            fetch_single,
+            desc="Ticker info"
+        )
+
     @staticmethod
     def compare_stocks(tickers: list[str], growth: float | None = None,
                        term_growth: float = 0.025, wacc: float | None = None,
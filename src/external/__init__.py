@@ -1,4 +1,4 @@
-"""External data source integrations (FRED, Shiller, Damodaran, XBRL)."""
+"""External data source integrations (FRED, Shiller, Damodaran, XBRL, filing text)."""
 
 from src.external.fred import FredConnector, get_fred_connector
 from src.external.shiller import (
@@ -13,6 +13,7 @@ from src.external.damodaran import (
     SectorPriors,
 )
 from src.external.xbrl_parser import XBRLDirectParser
+from src.external.filing_parser import FinancialMetric, parse_filings
 
 __all__ = [
     # FRED
@@ -29,4 +30,7 @@ __all__ = [
     "SectorPriors",
     # XBRL
     "XBRLDirectParser",
+    # GPT filing parser
+    "FinancialMetric",
+    "parse_filings",
 ]
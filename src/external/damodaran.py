@@ -143,6 +143,9 @@ class DamodaranLoader:
         self._margin_cache = self._load_from_disk("margin")
         self._cache_timestamp = self._load_timestamp()
         
+        # Parsed priors by sector; rebuilt whenever the datasets are refreshed
+        self._sector_index: dict[str, SectorPriors] = {}
+        
         # If disk cache is invalid or missing, clear it
         if not self._is_cache_valid():
             self._beta_cache = None
@@ -159,33 +162,61 @@ class DamodaranLoader:
         Returns:
             SectorPriors with available statistics
         """
-        damodaran_sector = self.SECTOR_MAPPING.get(sector)
+        return self.get_sector_priors_batch([sector])[sector]
 
-        if damodaran_sector is None:
-            print(
-                f"⚠️  Sector '{sector}' not mapped to Damodaran dataset. "
-                f"Using generic defaults."
-            )
-            return self._get_generic_priors(sector)
+    def get_sector_priors_batch(self, sectors: list[str]) -> dict[str, SectorPriors]:
+        """
+        Get sector priors for several sectors at once.
 
-        try:
-            if not self._is_cache_valid():
-                self._refresh_cache()
+        The cache is checked (and refreshed if stale) once for the whole
+        batch instead of once per sector. Each sector is parsed once per
+        dataset refresh; later lookups are served from an in-memory index.
 
-            if self._beta_cache is not None and self._margin_cache is not None:
-                return self._parse_sector_data(sector, damodaran_sector)
-            else:
+        Args:
+            sectors: Sector names (yfinance format)
+
+        Returns:
+            Dictionary of sector name → SectorPriors, in input order
+        """
+        mapped = [s for s in dict.fromkeys(sectors) if s in self.SECTOR_MAPPING]
+
+        cache_ready = False
+        if mapped:
+            try:
+                if not self._is_cache_valid():
+                    self._refresh_cache()
+                cache_ready = self._beta_cache is not None and self._margin_cache is not None
+            except Exception as e:
+                print(f"⚠️  Failed to load Damodaran data: {e}. Using generic priors")
+
+        priors: dict[str, SectorPriors] = {}
+        for sector in dict.fromkeys(sectors):
+            damodaran_sector = self.SECTOR_MAPPING.get(sector)
+            if damodaran_sector is None:
+                print(
+                    f"⚠️  Sector '{sector}' not mapped to Damodaran dataset. "
+                    f"Using generic defaults."
+                )
+                priors[sector] = self._get_generic_priors(sector)
+            elif not cache_ready:
                 print(
                     f"⚠️  Cache not available for {sector}, using generic priors"
                 )
-                return self._get_generic_priors(sector)
-
-        except Exception as e:
-            print(
-                f"⚠️  Failed to parse Damodaran data for {sector}: {e}. "
-                f"Using generic priors"
-            )
-            return self._get_generic_priors(sector)
+                priors[sector] = self._get_generic_priors(sector)
+            else:
+                if sector in self._sector_index:
+                    priors[sector] = self._sector_index[sector]
+                    continue
+                try:
+                    priors[sector] = self._parse_sector_data(sector, damodaran_sector)
+                    self._sector_index[sector] = priors[sector]
+                except Exception as e:
+                    print(
+                        f"⚠️  Failed to parse Damodaran data for {sector}: {e}. "
+                        f"Using generic priors"
+                    )
+                    priors[sector] = self._get_generic_priors(sector)
+        return priors
 
     def _load_from_disk(self, dataset: str) -> Optional[pd.DataFrame]:
         """Load cached dataset from disk.
@@ -253,6 +284,7 @@ class DamodaranLoader:
     def _refresh_cache(self) -> None:
         """Download fresh data from Damodaran's website and persist to disk."""
         print("📥 Refreshing Damodaran datasets...")
+        self._sector_index = {}
 
         try:
             print(f"   Downloading betas from {self.URL_BETAS}")
@@ -471,10 +503,7 @@ class DamodaranLoader:
         Returns:
             Dictionary of sector name → SectorPriors
         """
-        return {
-            sector: self.get_sector_priors(sector)
-            for sector in self.SECTOR_MAPPING.keys()
-        }
+        return self.get_sector_priors_batch(list(self.SECTOR_MAPPING))
 
 
 # Singleton instance
@@ -0,0 +1,148 @@
+"""
+GPT-based parsing of SEC filing text into typed financial metrics.
+
+Complements the direct XBRL parser for filings whose figures are only
+available as text. Uses OpenAI's json_schema response format, either one
+chat completion per filing or one Batch API job for many filings (half the
+token price, results within 24h). The OpenAI client is passed in, so the
+openai package is only needed by callers that actually parse.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.exceptions import DataFetchError
+
+logger = logging.getLogger(__name__)
+
+# Model used by both the synchronous and the Batch API path
+PARSING_MODEL = "gpt-4o-mini"
+
+# Batch API polling; jobs expire after their 24h completion window, so a
+# batch still running an hour past that is treated as stuck
+BATCH_POLL_SECONDS = 30
+BATCH_TIMEOUT_SECONDS = 25 * 3600
+
+_BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class FinancialMetric(BaseModel):
+    """Metrics extracted from filing text by the GPT parser."""
+
+    # Strict json_schema output requires additionalProperties: false
+    model_config = ConfigDict(extra="forbid")
+
+    revenue: float = Field(description="Total revenue in USD")
+    net_income: float = Field(description="Net income in USD")
+
+
+def _parsing_request_body(text: str) -> dict:
+    """Chat completion body asking for FinancialMetric JSON."""
+    return {
+        "model": PARSING_MODEL,
+        "messages": [
+            {"role": "system", "content": "Extract financial metrics from text."},
+            {"role": "user", "content": text},
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "FinancialMetric",
+                "schema": FinancialMetric.model_json_schema(),
+                "strict": True,
+            },
+        },
+    }
+
+
+def build_batch_requests(filings: dict[str, str]) -> list[dict]:
+    """One Batch API JSONL record per filing, keyed by accession number."""
+    return [
+        {
+            "custom_id": accession,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _parsing_request_body(text),
+        }
+        for accession, text in filings.items()
+    ]
+
+
+def parse_filings(
+    client: Any,
+    filings: dict[str, str],
+    mode: str = "sync",
+    poll_seconds: float = BATCH_POLL_SECONDS,
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+) -> dict[str, FinancialMetric]:
+    """
+    Parse filing text into FinancialMetric, keyed by accession number.
+
+    mode="sync" makes one chat completion per filing. mode="batch" submits
+    all filings as one OpenAI Batch API job and polls until it finishes;
+    filings whose request failed are left out of the result.
+
+    Args:
+        client: openai.OpenAI client (or anything with the same interface)
+        filings: Accession number -> filing text
+        mode: "sync" or "batch"
+        poll_seconds: Seconds between batch status checks
+        timeout: Seconds to wait for a batch before cancelling it
+
+    Returns:
+        Dict mapping accession numbers to parsed metrics
+
+    Raises:
+        ValueError: Unknown mode
+        DataFetchError: Batch failed, expired or was cancelled, or did not
+            finish within timeout (it is cancelled first)
+    """
+    if mode == "sync":
+        results = {}
+        for accession, text in filings.items():
+            response = client.chat.completions.create(**_parsing_request_body(text))
+            results[accession] = FinancialMetric.model_validate_json(response.choices[0].message.content)
+        return results
+    if mode != "batch":
+        raise ValueError(f"Unknown parsing mode: {mode!r} (expected 'sync' or 'batch')")
+
+    jsonl = "\n".join(json.dumps(record) for record in build_batch_requests(filings)).encode()
+    batch_file = client.files.create(file=("filings.jsonl", jsonl), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    deadline = time.monotonic() + timeout
+    while batch.status not in _BATCH_TERMINAL_STATUSES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            client.batches.cancel(batch.id)
+            raise DataFetchError(
+                f"OpenAI batch {batch.id} still {batch.status} after {timeout:.0f}s; cancelled",
+                source="openai",
+                details={"batch_id": batch.id, "status": batch.status},
+            )
+        time.sleep(min(poll_seconds, remaining))
+        batch = client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise DataFetchError(
+            f"OpenAI batch {batch.id} ended with status {batch.status}",
+            source="openai",
+            details={"batch_id": batch.id, "status": batch.status},
+        )
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            logger.warning(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+            continue
+        content = response["body"]["choices"][0]["message"]["content"]
+        results[record["custom_id"]] = FinancialMetric.model_validate_json(content)
+    return results
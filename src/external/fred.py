@@ -16,10 +16,13 @@ Usage:
 """
 
 import os
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from src.utils import default_cache
+
 try:
     from fredapi import Fred
     HAS_FREDAPI = True
@@ -30,6 +33,8 @@ except ImportError:
 # Fallback risk-free rate if FRED unavailable
 DEFAULT_RISK_FREE_RATE = 0.04  # 4%
 
+_MACRO_CACHE_KEY = "fred_macro_data"
+
 
 @dataclass
 class MacroData:
@@ -40,6 +45,15 @@ class MacroData:
     source: str = "FRED"
     fetched_at: Optional[datetime] = None
 
+    def to_dict(self) -> dict:
+        return {
+            "risk_free_rate": self.risk_free_rate,
+            "inflation_rate": self.inflation_rate,
+            "gdp_growth": self.gdp_growth,
+            "source": self.source,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+        }
+
 
 class FredConnector:
     """
@@ -51,7 +65,7 @@ class FredConnector:
     - GDP Growth: Real GDP annualized growth rate (A191RL1Q225SBEA)
     
     Features:
-    - 24-hour caching to reduce API calls
+    - 24-hour caching (in memory and on disk) to reduce API calls
     - Automatic fallback to DEFAULT_RISK_FREE_RATE if API unavailable
     - Graceful degradation if fredapi library not installed
     
@@ -70,7 +84,7 @@ class FredConnector:
         """
         self.cache_hours = cache_hours
         self._cached_data: Optional[MacroData] = None
-        self._cache_timestamp: Optional[datetime] = None
+        self._cache_timestamp: Optional[float] = None  # time.monotonic() of last fetch
         
         # Initialize FRED API client
         api_key = os.getenv("FRED_API_KEY")
@@ -97,8 +111,29 @@ class FredConnector:
         if self._cached_data is None or self._cache_timestamp is None:
             return False
         
-        elapsed_hours = (datetime.now() - self._cache_timestamp).total_seconds() / 3600
-        return elapsed_hours < self.cache_hours
+        return time.monotonic() - self._cache_timestamp < self.cache_hours * 3600
+    
+    def _load_disk_cache(self) -> Optional[MacroData]:
+        """Restore macro data persisted by an earlier process, if still fresh."""
+        cached = default_cache.get(_MACRO_CACHE_KEY, expiry_hours=self.cache_hours)
+        if not isinstance(cached, dict):
+            return None
+        try:
+            fetched_at = datetime.fromisoformat(cached['fetched_at'])
+            macro_data = MacroData(
+                risk_free_rate=cached['risk_free_rate'],
+                inflation_rate=cached['inflation_rate'],
+                gdp_growth=cached['gdp_growth'],
+                source=cached['source'],
+                fetched_at=fetched_at
+            )
+        except Exception:
+            return None
+        
+        # Age the in-memory entry from the original fetch, not from this load
+        self._cached_data = macro_data
+        self._cache_timestamp = time.monotonic() - (datetime.now() - fetched_at).total_seconds()
+        return macro_data
     
     def get_risk_free_rate(self) -> float:
         """
@@ -121,6 +156,10 @@ class FredConnector:
         if self._is_cache_valid():
             return self._cached_data
         
+        disk_cached = self._load_disk_cache()
+        if disk_cached is not None:
+            return disk_cached
+        
         # Fallback if FRED not available
         if self.fred is None:
             return MacroData(
@@ -163,7 +202,8 @@ class FredConnector:
             )
             
             self._cached_data = macro_data
-            self._cache_timestamp = datetime.now()
+            self._cache_timestamp = time.monotonic()
+            default_cache.set(_MACRO_CACHE_KEY, macro_data.to_dict())
             
             return macro_data
             
@@ -18,6 +18,7 @@ Usage:
 """
 
 import re
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
@@ -25,6 +26,8 @@ from typing import Optional
 import pandas as pd
 import requests
 
+from src.utils import default_cache
+
 
 # Default CAPE thresholds and scalars (can be overridden in function calls)
 CAPE_THRESHOLD_LOW = 15.0  # Below this = cheap market
@@ -41,11 +44,44 @@ class CapeData:
     percentile: Optional[float] = None
     fetched_at: Optional[datetime] = None
 
+    def to_dict(self) -> dict:
+        return {
+            "cape_ratio": self.cape_ratio,
+            "market_state": self.market_state,
+            "percentile": self.percentile,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+        }
+
 
 # Caching for Shiller CAPE data (updates monthly, so cache for 1 week)
 _cape_cache: Optional[CapeData] = None
-_cape_cache_timestamp: Optional[datetime] = None
+_cape_cache_timestamp: Optional[float] = None  # time.monotonic() of last fetch
 _CAPE_CACHE_HOURS = 168  # 1 week
+_CAPE_DISK_CACHE_KEY = "shiller_cape_data"  # "shiller_cape" belongs to src.regime
+
+
+def _load_cape_disk_cache() -> Optional[CapeData]:
+    """Restore CAPE data persisted by an earlier process into the module cache."""
+    global _cape_cache, _cape_cache_timestamp
+    
+    cached = default_cache.get(_CAPE_DISK_CACHE_KEY, expiry_hours=_CAPE_CACHE_HOURS)
+    if not isinstance(cached, dict):
+        return None
+    try:
+        fetched_at = datetime.fromisoformat(cached['fetched_at'])
+        cape_data = CapeData(
+            cape_ratio=cached['cape_ratio'],
+            market_state=cached['market_state'],
+            percentile=cached['percentile'],
+            fetched_at=fetched_at
+        )
+    except Exception:
+        return None
+    
+    # Age the in-memory entry from the original fetch, not from this load
+    _cape_cache = cape_data
+    _cape_cache_timestamp = time.monotonic() - (datetime.now() - fetched_at).total_seconds()
+    return cape_data
 
 
 def get_shiller_data() -> Optional[pd.DataFrame]:
@@ -129,10 +165,13 @@ def get_current_cape() -> float:
     
     # Check cache
     if _cape_cache is not None and _cape_cache_timestamp is not None:
-        elapsed_hours = (datetime.now() - _cape_cache_timestamp).total_seconds() / 3600
-        if elapsed_hours < _CAPE_CACHE_HOURS:
+        if time.monotonic() - _cape_cache_timestamp < _CAPE_CACHE_HOURS * 3600:
             return _cape_cache.cape_ratio
     
+    disk_cached = _load_cape_disk_cache()
+    if disk_cached is not None:
+        return disk_cached.cape_ratio
+    
     # Fetch new data
     df = get_shiller_data()
     
@@ -162,7 +201,8 @@ def get_current_cape() -> float:
             percentile=percentile,
             fetched_at=datetime.now()
         )
-        _cape_cache_timestamp = datetime.now()
+        _cape_cache_timestamp = time.monotonic()
+        default_cache.set(_CAPE_DISK_CACHE_KEY, _cape_cache.to_dict())
         
         return current_cape
         
@@ -96,28 +96,38 @@ class JSONFormatter(logging.Formatter):
 
 
 class DCFLogger(logging.Logger):
-    """Extended logger with structured field support."""
+    """Extended logger with structured field support.
     
-    def _log_with_fields(self, level: int, msg: str, fields: dict[str, Any] | None = None, **kwargs) -> None:
+    Registered as the global logger class, so third-party loggers created
+    after import are DCFLoggers too; positional %-args and the standard
+    logging keywords must keep working for them.
+    """
+    
+    _LOGGING_KWARGS = ("exc_info", "stack_info", "stacklevel", "extra")
+    
+    def _log_with_fields(self, level: int, msg: str, args: tuple, fields: dict[str, Any]) -> None:
         """Log with optional structured fields."""
-        extra = kwargs.pop('extra', {})
-        extra['extra_fields'] = fields or {}
-        super()._log(level, msg, args=(), extra=extra, **kwargs)
+        if not self.isEnabledFor(level):
+            return
+        kwargs = {key: fields.pop(key) for key in self._LOGGING_KWARGS if key in fields}
+        extra = kwargs.pop('extra', None) or {}
+        extra['extra_fields'] = fields
+        super()._log(level, msg, args, extra=extra, **kwargs)
     
-    def debug(self, msg: str, **fields) -> None:
-        self._log_with_fields(logging.DEBUG, msg, fields)
+    def debug(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log_with_fields(logging.DEBUG, msg, args, fields)
     
-    def info(self, msg: str, **fields) -> None:
-        self._log_with_fields(logging.INFO, msg, fields)
+    def info(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log_with_fields(logging.INFO, msg, args, fields)
     
-    def warning(self, msg: str, **fields) -> None:
-        self._log_with_fields(logging.WARNING, msg, fields)
+    def warning(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log_with_fields(logging.WARNING, msg, args, fields)
     
-    def error(self, msg: str, **fields) -> None:
-        self._log_with_fields(logging.ERROR, msg, fields)
+    def error(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log_with_fields(logging.ERROR, msg, args, fields)
     
-    def critical(self, msg: str, **fields) -> None:
-        self._log_with_fields(logging.CRITICAL, msg, fields)
+    def critical(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log_with_fields(logging.CRITICAL, msg, args, fields)
 
 
 # Register custom logger class
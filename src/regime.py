@@ -7,10 +7,14 @@ Also includes:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 import yfinance as yf
@@ -18,6 +22,9 @@ import yfinance as yf
 from src.config import config
 from src.utils import default_cache, rate_limiter
 
+if TYPE_CHECKING:
+    from src.external.fred import FredConnector
+
 
 class MarketRegime(Enum):
     """Market regime states."""
@@ -100,7 +107,7 @@ class RegimeDetector:
         self.cache_duration = cache_duration
         self.use_vix = use_vix
         self._cached_result: RegimeResult | None = None
-        self._cache_timestamp: datetime | None = None
+        self._cache_timestamp: float | None = None  # time.monotonic() of last fetch
         self._last_error: str | None = None
 
     @property
@@ -108,9 +115,9 @@ class RegimeDetector:
         return self._last_error
 
     def _is_cache_valid(self) -> bool:
-        if not self._cached_result or not self._cache_timestamp:
+        if not self._cached_result or self._cache_timestamp is None:
             return False
-        return (datetime.now() - self._cache_timestamp).total_seconds() < self.cache_duration
+        return time.monotonic() - self._cache_timestamp < self.cache_duration
 
     def _get_spy_history(self, ticker: str, lookback_days: int) -> pd.DataFrame | None:
         """Fetch SPY data with caching."""
@@ -257,7 +264,7 @@ class RegimeDetector:
                 )
 
             self._cached_result = result
-            self._cache_timestamp = datetime.now()
+            self._cache_timestamp = time.monotonic()
             return result
         except Exception as e:
             self._last_error = f"Error calculating regime: {e}"
@@ -283,7 +290,35 @@ class RegimeDetector:
 # Risk-Free Rate & CAPE Macro Valuation Functions
 # ============================================================================
 
-@rate_limiter
+# External connectors are imported lazily (optional deps, slow first import)
+# and resolved once, instead of re-running the import on every cache miss.
+_external_lock = threading.Lock()
+_fred_connector: FredConnector | None = None
+_shiller_cape_fn: Callable[[], float] | None = None
+
+
+def _get_fred_connector() -> FredConnector:
+    """Return the shared FRED connector, importing it on first use."""
+    global _fred_connector
+    if _fred_connector is None:
+        with _external_lock:
+            if _fred_connector is None:
+                from src.external.fred import get_fred_connector
+                _fred_connector = get_fred_connector()
+    return _fred_connector
+
+
+def _get_shiller_cape_fn() -> Callable[[], float]:
+    """Return src.external.shiller.get_current_cape, importing it on first use."""
+    global _shiller_cape_fn
+    if _shiller_cape_fn is None:
+        with _external_lock:
+            if _shiller_cape_fn is None:
+                from src.external.shiller import get_current_cape as get_shiller_cape
+                _shiller_cape_fn = get_shiller_cape
+    return _shiller_cape_fn
+
+
 def get_10year_treasury_yield() -> float | None:
     """Fetch current 10-year Treasury yield as risk-free rate.
     
@@ -304,8 +339,7 @@ def get_10year_treasury_yield() -> float | None:
     
     # Priority 1: Try FRED API (authoritative source)
     try:
-        from src.external.fred import get_fred_connector
-        fred = get_fred_connector()
+        fred = _get_fred_connector()
         if fred.fred is not None:  # FRED API available
             macro_data = fred.get_macro_data()
             if macro_data and macro_data.risk_free_rate:
@@ -316,8 +350,9 @@ def get_10year_treasury_yield() -> float | None:
     except Exception:
         pass
     
-    # Priority 2: Fallback to yfinance ^TNX
+    # Priority 2: Fallback to yfinance ^TNX (only this tier spends the yfinance budget)
     try:
+        rate_limiter.wait()
         treasury = yf.Ticker("^TNX")
         data = treasury.history(period="5d")
         
@@ -338,22 +373,35 @@ def get_10year_treasury_yield() -> float | None:
     return config.RISK_FREE_RATE
 
 
-@dataclass
+_CAPE_STATES = ("CHEAP", "FAIR", "EXPENSIVE")
+
+
+def _cape_state(cape: float) -> str:
+    """Classify CAPE into CHEAP/FAIR/EXPENSIVE (both thresholds count as FAIR)."""
+    # Index 0 below the low threshold, 2 above the high one, 1 in between
+    return _CAPE_STATES[(cape >= config.CAPE_LOW_THRESHOLD) + (cape > config.CAPE_HIGH_THRESHOLD)]
+
+
+@dataclass(slots=True)
 class CapeData:
     """Shiller CAPE (Cyclically Adjusted PE) ratio data."""
     cape_ratio: float
     last_updated: datetime
     market_state: str  # "CHEAP", "FAIR", "EXPENSIVE"
+    _last_updated_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # last_updated is never reassigned, so format it once
+        self._last_updated_iso = self.last_updated.isoformat()
     
     def to_dict(self) -> dict:
         return {
             "cape_ratio": self.cape_ratio,
-            "last_updated": self.last_updated.isoformat(),
+            "last_updated": self._last_updated_iso,
             "market_state": self.market_state,
         }
 
 
-@rate_limiter  
 def get_current_cape() -> CapeData | None:
     """Fetch current Shiller CAPE ratio for market valuation assessment.
     
@@ -383,24 +431,19 @@ def get_current_cape() -> CapeData | None:
         except Exception:
             pass
     
+    # One timestamp for whichever source below produces the value
+    fetched_at = datetime.now(UTC)
+    
     # Priority 1: Try Yale Shiller dataset (authoritative source)
     try:
-        from src.external.shiller import get_current_cape as get_shiller_cape
-        shiller_cape = get_shiller_cape()
+        shiller_cape = _get_shiller_cape_fn()()
         
         if shiller_cape and 5 < shiller_cape < 100:  # Sanity check
             # Classify market state based on historical CAPE ranges
-            if shiller_cape < config.CAPE_LOW_THRESHOLD:
-                market_state = "CHEAP"
-            elif shiller_cape > config.CAPE_HIGH_THRESHOLD:
-                market_state = "EXPENSIVE"
-            else:
-                market_state = "FAIR"
-            
             cape_data = CapeData(
                 cape_ratio=shiller_cape,
-                last_updated=datetime.now(),
-                market_state=market_state
+                last_updated=fetched_at,
+                market_state=_cape_state(shiller_cape)
             )
             default_cache.set(cache_key, cape_data.to_dict())
             return cape_data
@@ -409,36 +452,33 @@ def get_current_cape() -> CapeData | None:
     
     # Priority 2: Fallback to yfinance PE ratio estimate
     try:
-        # Try SPY ETF (more reliable than ^GSPC)
-        spy = yf.Ticker("SPY")
-        spy_info = spy.info
+        # One Tickers container so SPY and ^GSPC share a session/crumb;
+        # .info is still one request each, so ^GSPC is only hit when needed
+        index_tickers = yf.Tickers("SPY ^GSPC").tickers
+
+        # Try SPY ETF first (more reliable than ^GSPC)
+        rate_limiter.wait()
+        spy_info = index_tickers["SPY"].info or {}
         pe_ratio = spy_info.get('trailingPE')
-        
+
         # If SPY fails, try S&P 500 index
         if not pe_ratio or pe_ratio <= 0:
-            sp500 = yf.Ticker("^GSPC")
-            sp500_info = sp500.info
+            rate_limiter.wait()
+            sp500_info = index_tickers["^GSPC"].info or {}
             pe_ratio = sp500_info.get('trailingPE')
-        
-        # Use forward PE if trailing not available
-        if not pe_ratio or pe_ratio <= 0:
-            pe_ratio = spy_info.get('forwardPE') or sp500_info.get('forwardPE')
+
+            # Use forward PE if trailing not available
+            if not pe_ratio or pe_ratio <= 0:
+                pe_ratio = spy_info.get('forwardPE') or sp500_info.get('forwardPE')
         
         if pe_ratio and 5 < pe_ratio < 100:  # Sanity check
             # CAPE is typically 15-30% higher than TTM PE (due to smoothing)
             cape_estimate = pe_ratio * 1.2
             
-            if cape_estimate < config.CAPE_LOW_THRESHOLD:
-                market_state = "CHEAP"
-            elif cape_estimate > config.CAPE_HIGH_THRESHOLD:
-                market_state = "EXPENSIVE"
-            else:
-                market_state = "FAIR"
-            
             cape_data = CapeData(
                 cape_ratio=cape_estimate,
-                last_updated=datetime.now(),
-                market_state=market_state
+                last_updated=fetched_at,
+                market_state=_cape_state(cape_estimate)
             )
             default_cache.set(cache_key, cape_data.to_dict())
             return cape_data
@@ -451,7 +491,7 @@ def get_current_cape() -> CapeData | None:
         fallback_cape = 25.0  # Moderate valuation
         cape_data = CapeData(
             cape_ratio=fallback_cape,
-            last_updated=datetime.now(),
+            last_updated=fetched_at,
             market_state="FAIR"
         )
         return cape_data
@@ -478,15 +518,16 @@ def calculate_cape_wacc_adjustment() -> float:
         return 0.0
     
     cape = cape_data.cape_ratio
+    market_state = _cape_state(cape)
     
     # Cheap market: Reduce WACC by up to 50bps (lower risk premium justified)
-    if cape < config.CAPE_LOW_THRESHOLD:
+    if market_state == "CHEAP":
         # Scale linearly: CAPE 10 → -50bps, CAPE 15 → 0bps
         adjustment = -0.005 * (config.CAPE_LOW_THRESHOLD - cape) / 5
         return max(adjustment, -0.005)  # Cap at -50bps
     
     # Expensive market: Increase WACC by up to 100bps (higher risk premium)
-    elif cape > config.CAPE_HIGH_THRESHOLD:
+    elif market_state == "EXPENSIVE":
         # Scale linearly: CAPE 35 → 0bps, CAPE 45 → +100bps
         adjustment = 0.01 * (cape - config.CAPE_HIGH_THRESHOLD) / 10
         return min(adjustment, 0.01)  # Cap at +100bps
@@ -504,6 +545,12 @@ def get_dynamic_risk_free_rate() -> tuple[float, str]:
     rf_rate = get_10year_treasury_yield()
     
     if rf_rate and rf_rate != config.RISK_FREE_RATE:
-        return rf_rate, f"10Y Treasury: {rf_rate*100:.2f}%"
+        return _format_risk_free_rate(rf_rate, "10Y Treasury")
     else:
-        return config.RISK_FREE_RATE, f"Static (config): {config.RISK_FREE_RATE*100:.2f}%"
+        return _format_risk_free_rate(config.RISK_FREE_RATE, "Static (config)")
+
+
+@lru_cache(maxsize=16)
+def _format_risk_free_rate(rate: float, label: str) -> tuple[float, str]:
+    """Build the (rate, source_message) pair once per distinct rate."""
+    return rate, f"{label}: {rate*100:.2f}%"
@@ -2,52 +2,138 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
+import inspect
 import json
+import os
+import queue
+import random
+import threading
 import time
-from collections.abc import Callable
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
-from functools import wraps
+from functools import partial, wraps
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
 
 import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+from pyarrow import parquet as pq
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from src.logging_config import get_logger
 
 T = TypeVar('T')
 
+logger = get_logger(__name__)
+
+
+def _dump_json(data: Any) -> bytes:
+    """Encode cache payloads (orjson when installed; str() for unknown types)."""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, default=str).encode()
+
+
+def _load_json(raw: bytes) -> Any:
+    """Decode cache payloads; stdlib json also accepts NaN written by older entries."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
 
 class RateLimiter:
-    """Rate limiter for API calls (~60 calls/minute recommended for yfinance)."""
+    """Rate limiter for API calls (~60 calls/minute recommended for yfinance).
+
+    Thread-safe: each caller reserves the next free slot under a short lock
+    and sleeps outside it, so concurrent callers are spaced min_interval
+    apart instead of racing on a shared timestamp.
+    """
 
     def __init__(self, calls_per_minute: int = 60):
         self.min_interval = 60 / calls_per_minute
-        self.last_call = 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
 
     def __call__(self, func: Callable) -> Callable:
+        # Coroutine functions get an awaiting wrapper so the event loop keeps running
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await self.wait_async()
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            elapsed = time.time() - self.last_call
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-            self.last_call = time.time()
+            self.wait()
             return func(*args, **kwargs)
         return wrapper
 
+    def _reserve(self) -> float:
+        """Claim the next call slot; returns seconds to wait until it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        return slot - now
+
     def wait(self) -> None:
         """Manual rate limit wait."""
-        elapsed = time.time() - self.last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_call = time.time()
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        """Rate limit wait for coroutines (yields to the event loop instead of blocking)."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Cache file formats in lookup order: Arrow IPC/Feather (DataFrames), legacy
+# Parquet (DataFrames written by older versions), JSON (metadata/dicts)
+_CACHE_EXTENSIONS = ("arrow", "parquet", "json")
+
+_MISSING = object()
 
 
 class DataCache:
-    """File-based cache manager for API responses using Parquet format.
+    """File-based cache manager for API responses using Arrow IPC (Feather) format.
 
     Provides efficient caching of pandas DataFrames and yfinance responses
-    to avoid rate limits and speed up repeated queries.
+    to avoid rate limits and speed up repeated queries. Writes are handed to
+    a background thread; call flush() to wait for them to reach disk.
     """
 
+    # Arrow tables kept memory-mapped for repeat reads
+    MAX_MAPPED_TABLES = 64
+
+    # One writer thread per process, shared by every instance, so flush()
+    # on any instance also covers writes queued through another
+    _write_queue: queue.Queue[tuple[DataCache, str, Any]] = queue.Queue()
+    _writer: threading.Thread | None = None
+    _writer_lock = threading.Lock()
+    # Live instances, so a forked child can reset their per-instance write state
+    _instances: weakref.WeakSet[DataCache] = weakref.WeakSet()
+
     def __init__(self, cache_dir: str = "data/cache", default_expiry_hours: int = 24):
         """Initialize cache manager.
 
@@ -58,82 +144,244 @@ class DataCache:
         self.cache_dir = Path(cache_dir)
         self.default_expiry_hours = default_expiry_hours
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def _get_cache_path(self, key: str, extension: str = "parquet") -> Path:
+        # key -> (file, mtime) of entries seen by this instance, so repeat
+        # lookups stat one known file instead of probing every extension
+        self._index: dict[str, tuple[Path, float]] = {}
+        # key -> (mtime, memory-mapped Arrow table), LRU-bounded
+        self._mapped: OrderedDict[str, tuple[float, pa.Table]] = OrderedDict()
+        self._mapped_lock = threading.Lock()
+        # Latest queued-but-unwritten payload per key, served by get()
+        self._pending: dict[str, pd.DataFrame | bytes] = {}
+        self._pending_lock = threading.Lock()
+        # Keys whose background write failed, reported by flush()
+        self._failed_writes: list[str] = []
+        self._instances.add(self)
+
+    def _get_cache_path(self, key: str, extension: str = "arrow") -> Path:
         """Generate cache file path for a key."""
         # Sanitize key for filesystem
         safe_key = key.replace("/", "_").replace("\\", "_")
         return self.cache_dir / f"{safe_key}.{extension}"
 
-    def _is_cache_valid(self, file_path: Path, expiry_hours: int) -> bool:
-        """Check if cache file exists and is not expired."""
-        if not file_path.exists():
-            return False
+    def _lookup(self, key: str, extensions: tuple[str, ...] = _CACHE_EXTENSIONS) -> tuple[Path, float] | None:
+        """Find a key's cache file and current mtime.
 
-        try:
-            file_age = datetime.now() - datetime.fromtimestamp(file_path.stat().st_mtime)
-            return file_age < timedelta(hours=expiry_hours)
-        except (OSError, ValueError):
-            return False
+        An indexed key costs one stat() of its known file (so rewrites by
+        another process or DataCache instance are seen); only an index miss
+        probes every extension.
+        """
+        entry = self._index.get(key)
+        if entry is not None:
+            path = entry[0]
+            try:
+                entry = (path, path.stat().st_mtime)
+            except OSError:
+                # Removed (or rewritten in another format) behind our back
+                self._forget(key)
+                entry = None
+            else:
+                self._index[key] = entry
+                return entry
 
-    def get(self, key: str, expiry_hours: int | None = None) -> Any | None:
+        for extension in extensions:
+            path = self._get_cache_path(key, extension)
+            try:
+                entry = (path, path.stat().st_mtime)
+            except OSError:
+                continue
+            self._index[key] = entry
+            return entry
+        return None
+
+    def _mapped_table(self, key: str, path: Path, mtime: float) -> pa.Table:
+        """Memory-mapped Arrow table for a key, reused while the file is unchanged."""
+        with self._mapped_lock:
+            cached = self._mapped.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._mapped.move_to_end(key)
+                return cached[1]
+
+        table = feather.read_table(path, memory_map=True)
+        with self._mapped_lock:
+            self._mapped[key] = (mtime, table)
+            self._mapped.move_to_end(key)
+            while len(self._mapped) > self.MAX_MAPPED_TABLES:
+                self._mapped.popitem(last=False)
+        return table
+
+    def _forget(self, key: str) -> None:
+        """Drop a key from the in-memory index and mapped-table cache."""
+        self._index.pop(key, None)
+        with self._mapped_lock:
+            self._mapped.pop(key, None)
+
+    def get(
+        self, key: str, expiry_hours: int | None = None, extensions: tuple[str, ...] = _CACHE_EXTENSIONS
+    ) -> Any | None:
         """Retrieve cached data if valid.
 
         Args:
             key: Cache key (typically ticker or unique identifier)
             expiry_hours: Override default expiry hours
+            extensions: File formats to probe on an index miss, in order
 
         Returns:
             Cached data or None if not found/expired
         """
         expiry = expiry_hours if expiry_hours is not None else self.default_expiry_hours
 
-        # Check for Parquet file first (DataFrame)
-        parquet_path = self._get_cache_path(key, "parquet")
-        if self._is_cache_valid(parquet_path, expiry):
-            try:
-                return pd.read_parquet(parquet_path)
-            except Exception:
-                pass
+        # Freshly set data still waiting for the writer thread (handed out as
+        # a copy so callers can't alter what is about to be written)
+        pending = self._pending.get(key, _MISSING)
+        if pending is not _MISSING:
+            return pending.copy() if isinstance(pending, pd.DataFrame) else _load_json(pending)
 
-        # Check for JSON file (metadata/dict)
-        json_path = self._get_cache_path(key, "json")
-        if self._is_cache_valid(json_path, expiry):
-            try:
-                with open(json_path) as f:
-                    return json.load(f)
-            except Exception:
-                pass
+        entry = self._lookup(key, extensions)
+        if entry is None:
+            return None
 
-        return None
+        path, mtime = entry
+        if time.time() - mtime >= expiry * 3600:
+            self._forget(key)
+            return None
+
+        try:
+            if path.suffix == ".arrow":
+                # Zero-copy columns would be read-only views of the map; callers
+                # get a writable frame, as with the old read_parquet() path
+                return self._mapped_table(key, path, mtime).to_pandas(split_blocks=True).copy()
+            if path.suffix == ".parquet":
+                # Straight to pyarrow, skipping pandas' engine dispatch
+                return pq.read_table(path).to_pandas()
+            return _load_json(path.read_bytes())
+        except Exception:
+            self._forget(key)
+            return None
 
     def set(self, key: str, data: Any) -> bool:
         """Store data in cache.
 
+        The data is snapshotted now (DataFrames copied, everything else
+        encoded to JSON), so later changes to the caller's object are not
+        cached. The disk write happens on a background thread; get() returns
+        the snapshot immediately in the meantime, and flush() reports
+        whether the writes succeeded.
+
         Args:
             key: Cache key
             data: Data to cache (DataFrame or JSON-serializable)
 
         Returns:
-            True if successful, False otherwise
+            True once the write is queued, False if data could not be encoded
+        """
+        try:
+            snapshot = data.copy() if isinstance(data, pd.DataFrame) else _dump_json(data)
+        except Exception:
+            return False
+
+        # Release any mapping of the old file before it is overwritten
+        self._forget(key)
+        with self._pending_lock:
+            self._pending[key] = snapshot
+        self._ensure_writer()
+        self._write_queue.put((self, key, snapshot))
+        return True
+
+    @classmethod
+    def _ensure_writer(cls) -> None:
+        """Start the shared writer thread on first use."""
+        if cls._writer is not None:
+            return
+        with cls._writer_lock:
+            if cls._writer is None:
+                cls._writer = threading.Thread(target=cls._writer_loop, name="cache-writer", daemon=True)
+                cls._writer.start()
+                atexit.register(cls._join_writes)
+
+    @classmethod
+    def _join_writes(cls) -> None:
+        """Wait for the current process's queued writes (atexit hook)."""
+        cls._write_queue.join()
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        """Give a forked child its own, empty write queue.
+
+        Only the forking thread survives fork(): the inherited writer thread
+        is gone (so the queue would never drain and flush() would hang) and
+        any lock held at fork time stays held. Writes still pending in the
+        parent are left to the parent's writer.
         """
+        cls._write_queue = queue.Queue()
+        cls._writer = None
+        cls._writer_lock = threading.Lock()
+        for cache in list(cls._instances):
+            cache._pending = {}
+            cache._pending_lock = threading.Lock()
+            cache._failed_writes = []
+            cache._mapped_lock = threading.Lock()
+
+    @classmethod
+    def _writer_loop(cls) -> None:
+        """Drain queued writes, skipping payloads superseded by a later set()."""
+        while True:
+            cache, key, data = cls._write_queue.get()
+            try:
+                if cache._pending.get(key, _MISSING) is not data:
+                    continue
+                if not cache._write(key, data):
+                    cache._failed_writes.append(key)
+                with cache._pending_lock:
+                    if cache._pending.get(key, _MISSING) is data:
+                        del cache._pending[key]
+            finally:
+                cls._write_queue.task_done()
+
+    def _write(self, key: str, data: pd.DataFrame | bytes) -> bool:
+        """Write one set() snapshot (DataFrame or encoded JSON) to disk."""
         try:
             if isinstance(data, pd.DataFrame):
+                # Uncompressed: payloads are small, and reads skip decompression
                 cache_path = self._get_cache_path(key)
-                data.to_parquet(cache_path, compression='snappy', index=True)
+                write = partial(feather.write_feather, data, compression="uncompressed")
             else:
                 # Store as JSON for non-DataFrame data
-                json_path = self._get_cache_path(key, "json")
-                with open(json_path, 'w') as f:
-                    json.dump(data, f, default=str)
+                cache_path = self._get_cache_path(key, "json")
+                write = partial(Path.write_bytes, data=data)
+            # Write-then-rename: readers in other processes never see a
+            # partial file, and a table mapped from the old file (here or in
+            # another instance) does not see it truncated
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            try:
+                write(tmp_path)
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            self._index[key] = (cache_path, time.time())
             return True
         except Exception:
-            # Fail silently - caching is optional
+            # Caching is optional; the failure is reported by flush()
             return False
 
+    def flush(self) -> bool:
+        """Block until all queued writes are on disk.
+
+        Returns:
+            True if every write queued through this instance since the last
+            flush() succeeded (failed keys are logged)
+        """
+        self._write_queue.join()
+        failed, self._failed_writes = self._failed_writes, []
+        if failed:
+            logger.warning(f"Cache writes failed for: {', '.join(failed)}")
+        return not failed
+
     def invalidate(self, key: str) -> None:
         """Remove cache entry."""
-        for ext in ["parquet", "json"]:
+        self.flush()
+        self._forget(key)
+        for ext in _CACHE_EXTENSIONS:
             cache_path = self._get_cache_path(key, ext)
             if cache_path.exists():
                 try:
@@ -147,60 +395,170 @@ class DataCache:
         Returns:
             Number of files deleted
         """
+        self.flush()
+        self._index.clear()
+        with self._mapped_lock:
+            self._mapped.clear()
         count = 0
-        for file_path in self.cache_dir.glob("*"):
-            if file_path.is_file():
-                try:
-                    file_path.unlink()
-                    count += 1
-                except OSError:
-                    pass
+        # scandir entries carry their file type, so no stat() per file
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                        count += 1
+                    except OSError:
+                        pass
         return count
 
 
-def cache_response(expiry_hours: int = 24, cache_dir: str = "data/cache"):
-    """Decorator to cache function responses using Parquet files.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DataCache._reset_after_fork)
+
+
+# Cache file formats each cache_response return type can be stored as
+_RETURN_TYPE_EXTENSIONS: dict[str, tuple[str, ...]] = {
+    "dataframe": ("arrow", "parquet"),
+    "json": ("json",),
+    "auto": _CACHE_EXTENSIONS,
+}
+
+# Argument types that have a stable repr() and can key a cached response
+_KEYABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _keyable(value: Any) -> bool:
+    """Check a value (or tuple of values) can be part of a cache key."""
+    if isinstance(value, tuple):
+        return all(_keyable(v) for v in value)
+    return isinstance(value, _KEYABLE_TYPES)
+
+
+def _hash_args(func_name: str, args: tuple, kwargs: dict[str, Any]) -> str | None:
+    """Build a fixed-length cache key from a call's arguments.
+
+    Returns None when an argument has no canonical form (DataFrames, arrays,
+    arbitrary objects), in which case the call must not be cached.
+    """
+    if not all(map(_keyable, args)) or not all(map(_keyable, kwargs.values())):
+        return None
+
+    # Most calls pass zero or one keyword, which needs no sort
+    items = tuple(sorted(kwargs.items())) if len(kwargs) > 1 else tuple(kwargs.items())
+    digest = hashlib.blake2b(repr((args, items)).encode(), digest_size=8)
+    return f"{func_name}_{digest.hexdigest()}"
+
+
+# DataCache instances shared by cache_response, keyed by (cache_dir, expiry_hours)
+_CACHE_POOL: dict[tuple[str, int], DataCache] = {}
+_CACHE_POOL_LOCK = threading.Lock()
+
+
+def _shared_cache(cache_dir: str, expiry_hours: int) -> DataCache:
+    """Get the pooled DataCache for a directory, creating it on first use."""
+    key = (cache_dir, expiry_hours)
+    with _CACHE_POOL_LOCK:
+        cache = _CACHE_POOL.get(key)
+        if cache is None:
+            cache = _CACHE_POOL[key] = DataCache(cache_dir=cache_dir, default_expiry_hours=expiry_hours)
+        return cache
+
+
+def cache_response(
+    expiry_hours: int = 24,
+    cache_dir: str = "data/cache",
+    skip_self: bool | None = None,
+    return_type: Literal["dataframe", "json", "auto"] = "auto",
+):
+    """Decorator to cache function responses using Arrow IPC (Feather) files.
 
     Caches the return value of a function based on its arguments.
     Works best with functions that return pandas DataFrames or JSON-serializable objects.
+    Calls with arguments other than str/int/float/bool/None (or tuples of
+    them) are passed through uncached (logged once per function).
+    Concurrent calls that miss on the same key share a single call to the
+    wrapped function.
 
     Args:
         expiry_hours: Cache validity period in hours
         cache_dir: Directory to store cache files
+        skip_self: Leave the first argument out of the key (for methods);
+            None detects methods by a first parameter named self or cls
+        return_type: What the function returns - "dataframe" or "json" limits
+            cache misses to probing that format's files; "auto" probes all
 
     Usage:
         @cache_response(expiry_hours=24)
         def fetch_data(ticker: str) -> pd.DataFrame:
             return yf.download(ticker, period="1y")
     """
-    cache = DataCache(cache_dir=cache_dir, default_expiry_hours=expiry_hours)
+    cache = _shared_cache(cache_dir, expiry_hours)
+    extensions = _RETURN_TYPE_EXTENSIONS[return_type]
 
     def decorator(func: Callable) -> Callable:
+        # Keys currently being fetched; concurrent misses wait on the event
+        in_flight: dict[str, threading.Event] = {}
+        in_flight_lock = threading.Lock()
+        skip_first = skip_self
+        if skip_first is None:
+            params = list(inspect.signature(func).parameters)
+            skip_first = bool(params) and params[0] in ("self", "cls")
+        warned_uncached = False
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
+            nonlocal warned_uncached
             # Generate cache key from function name and arguments
-            # For method calls, skip 'self' argument
-            cache_args = args[1:] if args and hasattr(args[0], '__dict__') else args
-
-            # Create cache key from function name and arguments
-            key_parts = [func.__name__]
-            key_parts.extend(str(arg) for arg in cache_args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = "_".join(key_parts)
+            cache_key = _hash_args(func.__name__, args[1:] if skip_first else args, kwargs)
+            if cache_key is None:
+                if not warned_uncached:
+                    warned_uncached = True
+                    logger.warning(
+                        f"{func.__qualname__}: arguments can't key the cache "
+                        "(pass skip_self=True for methods); calling uncached"
+                    )
+                return func(*args, **kwargs)
 
             # Try to get from cache
-            cached_data = cache.get(cache_key, expiry_hours)
+            cached_data = cache.get(cache_key, expiry_hours, extensions)
             if cached_data is not None:
                 return cached_data
 
-            # Call original function
-            result = func(*args, **kwargs)
+            with in_flight_lock:
+                event = in_flight.get(cache_key)
+                if event is None:
+                    event = in_flight[cache_key] = threading.Event()
+                    leader = True
+                else:
+                    leader = False
+
+            if not leader:
+                # Another thread is fetching this key; reuse its result
+                event.wait()
+                cached_data = cache.get(cache_key, expiry_hours, extensions)
+                if cached_data is not None:
+                    return cached_data
+                # The fetch failed or returned None, so try for ourselves
+                return func(*args, **kwargs)
+
+            try:
+                # A fetch may have completed between the miss and taking the lead
+                cached_data = cache.get(cache_key, expiry_hours, extensions)
+                if cached_data is not None:
+                    return cached_data
 
-            # Cache result if valid
-            if result is not None:
-                cache.set(cache_key, result)
+                # Call original function
+                result = func(*args, **kwargs)
 
-            return result
+                # Cache result if valid
+                if result is not None:
+                    cache.set(cache_key, result)
+
+                return result
+            finally:
+                with in_flight_lock:
+                    del in_flight[cache_key]
+                event.set()
 
         return wrapper
 
@@ -210,8 +568,8 @@ def cache_response(expiry_hours: int = 24, cache_dir: str = "data/cache"):
 # Global shared rate limiter instance
 rate_limiter = RateLimiter(calls_per_minute=60)
 
-# Global cache instance
-default_cache = DataCache(cache_dir="data/cache", default_expiry_hours=24)
+# Global cache instance, also used by cache_response(cache_dir="data/cache")
+default_cache = _shared_cache("data/cache", 24)
 
 
 def retry_with_backoff[T](
@@ -219,10 +577,15 @@ def retry_with_backoff[T](
     max_attempts: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    max_delay: float = 15.0,
+    args: tuple = (),
 ) -> T | None:
     """
-    Retry a function with exponential backoff.
+    Retry a function with exponential backoff and full jitter.
+
+    Each wait is drawn uniformly from [0, current delay], so parallel workers
+    failing together (e.g. a batch hitting HTTP 429) do not retry in lockstep.
 
     Args:
         func: Function to retry
@@ -230,6 +593,8 @@ def retry_with_backoff[T](
         initial_delay: Initial delay in seconds (default: 1.0)
         backoff_factor: Multiplier for delay on each retry (default: 2.0)
         exceptions: Tuple of exceptions to catch (default: all Exception)
+        max_delay: Cap on the backoff delay in seconds (default: 15.0)
+        args: Positional arguments passed to func on each attempt
 
     Returns:
         Function result or None if all attempts failed
@@ -241,15 +606,15 @@ def retry_with_backoff[T](
 
     for attempt in range(1, max_attempts + 1):
         try:
-            return func()
+            return func(*args)
         except exceptions:
             if attempt == max_attempts:
                 # Final attempt failed
                 return None
 
-            # Wait before retry
-            time.sleep(delay)
-            delay *= backoff_factor
+            # Wait before retry (full jitter)
+            time.sleep(random.uniform(0, min(delay, max_delay)))
+            delay = min(delay * backoff_factor, max_delay)
 
     return None
 
@@ -285,7 +650,8 @@ class ParallelFetcher:
         self,
         items: list[str],
         fetch_func: Callable[[str], T],
-        desc: str = "Fetching"
+        desc: str = "Fetching",
+        progress_callback: Callable[[str, bool], None] | None = None,
     ) -> dict[str, T | None]:
         """
         Fetch data for multiple items in parallel.
@@ -294,6 +660,8 @@ class ParallelFetcher:
             items: List of items to fetch (e.g., tickers)
             fetch_func: Function to fetch data for a single item
             desc: Description for progress tracking
+            progress_callback: Called as (item, succeeded) as each item completes
+                (e.g. to print progress or advance a tqdm bar); no output otherwise
             
         Returns:
             Dict mapping items to fetched data (None if failed)
@@ -314,19 +682,19 @@ class ParallelFetcher:
             }
             
             # Collect results as they complete
-            completed = 0
-            total = len(items)
-            
             for future in as_completed(future_to_item):
                 item = future_to_item[future]
-                completed += 1
                 
                 try:
                     results[item] = future.result()
-                    print(f"  [{completed}/{total}] ✅ {item}")
+                    succeeded = True
                 except Exception as e:
-                    print(f"  [{completed}/{total}] ❌ {item}: {e}")
+                    logger.debug(f"{desc}: {item} failed: {e}")
                     results[item] = None
+                    succeeded = False
+                
+                if progress_callback is not None:
+                    progress_callback(item, succeeded)
                     
         return results
         
@@ -335,7 +703,8 @@ class ParallelFetcher:
         items: list[str],
         fetch_func: Callable[[str], T],
         max_attempts: int = 3,
-        desc: str = "Fetching"
+        desc: str = "Fetching",
+        progress_callback: Callable[[str, bool], None] | None = None,
     ) -> dict[str, T | None]:
         """
         Fetch data with automatic retry on failure.
@@ -345,18 +714,85 @@ class ParallelFetcher:
             fetch_func: Function to fetch data for a single item
             max_attempts: Maximum retry attempts per item
             desc: Description for progress tracking
+            progress_callback: See fetch_batch()
             
         Returns:
             Dict mapping items to fetched data (None if all retries failed)
         """
-        def fetch_with_retry(item: str) -> T | None:
-            return retry_with_backoff(
-                lambda: fetch_func(item),
-                max_attempts=max_attempts
-            )
-            
-        return self.fetch_batch(items, fetch_with_retry, desc)
+        # One partial per batch; the item reaches fetch_func via args, not a per-item closure
+        fetch_with_retry = partial(self._fetch_with_retry, fetch_func, max_attempts)
+        return self.fetch_batch(items, fetch_with_retry, desc, progress_callback)
+
+    @staticmethod
+    def _fetch_with_retry(fetch_func: Callable[[str], T], max_attempts: int, item: str) -> T | None:
+        """Fetch one item, retrying with backoff."""
+        return retry_with_backoff(fetch_func, max_attempts=max_attempts, args=(item,))
 
 
 # Global parallel fetcher instance
 parallel_fetcher = ParallelFetcher(max_workers=5, rate_limit_per_min=60)
+
+
+class AsyncParallelFetcher:
+    """
+    asyncio counterpart of ParallelFetcher for coroutine-based fetchers.
+    
+    Each in-flight item is a task rather than a thread, so large batches can
+    overlap many waits cheaply. Concurrency is bounded by a semaphore and
+    request starts are spaced by a RateLimiter shared with the threaded code.
+    Blocking fetchers (e.g. yfinance) should keep using ParallelFetcher.
+    
+    Example:
+        fetcher = AsyncParallelFetcher(max_workers=20)
+        results = asyncio.run(fetcher.fetch_batch(["AAPL", "MSFT"], fetch_quote))
+    """
+    
+    def __init__(self, max_workers: int = 20, limiter: RateLimiter | None = None):
+        """
+        Initialize async fetcher.
+        
+        Args:
+            max_workers: Maximum concurrent in-flight fetches (default: 20)
+            limiter: Rate limiter to respect (default: the global rate_limiter)
+        """
+        self.max_workers = max_workers
+        self.limiter = limiter
+    
+    async def fetch_batch(
+        self,
+        items: list[str],
+        fetch_func: Callable[[str], Awaitable[T]],
+        desc: str = "Fetching",
+        progress_callback: Callable[[str, bool], None] | None = None,
+    ) -> dict[str, T | None]:
+        """
+        Fetch data for multiple items concurrently.
+        
+        Args:
+            items: List of items to fetch (e.g., tickers)
+            fetch_func: Coroutine function fetching a single item
+            desc: Description for progress tracking
+            progress_callback: See ParallelFetcher.fetch_batch()
+            
+        Returns:
+            Dict mapping items to fetched data (None if failed), in input order
+        """
+        limiter = self.limiter or rate_limiter
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def fetch_one(item: str) -> T | None:
+            async with semaphore:
+                await limiter.wait_async()
+                try:
+                    result = await fetch_func(item)
+                    succeeded = True
+                except Exception as e:
+                    logger.debug(f"{desc}: {item} failed: {e}")
+                    result = None
+                    succeeded = False
+            if progress_callback is not None:
+                progress_callback(item, succeeded)
+            return result
+        
+        results = await asyncio.gather(*(fetch_one(item) for item in items))
+        return dict(zip(items, results, strict=True))
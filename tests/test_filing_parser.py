@@ -0,0 +1,126 @@
+"""Unit tests for the GPT filing parser (fake OpenAI client, no network)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.exceptions import DataFetchError
+from src.external import filing_parser
+from src.external.filing_parser import FinancialMetric, build_batch_requests, parse_filings
+
+FILINGS = {"0000320193-23-000106": "Revenue: $394.3B", "0000320193-22-000108": "x"}
+
+
+def _output_line(custom_id: str, revenue: float = 1.0, status_code: int = 200, error: dict | None = None) -> str:
+    """One Batch API output JSONL line."""
+    content = json.dumps({"revenue": revenue, "net_income": revenue / 4})
+    body = {"choices": [{"message": {"content": content}}]}
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {"status_code": status_code, "body": body},
+        "error": error,
+    })
+
+
+class FakeBatchClient:
+    """Just enough of openai.OpenAI for parse_filings(mode="batch").
+
+    Each retrieve() returns the next status in statuses (the last one repeats).
+    """
+
+    def __init__(self, statuses: list[str], output: str = ""):
+        self.statuses = list(statuses)
+        self.output = output
+        self.uploaded: list[dict] = []
+        self.retrieved = 0
+        self.cancelled: list[str] = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve, cancel=self._cancel)
+
+    def _create_file(self, file, purpose):
+        self.uploaded = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    def _content(self, file_id):
+        assert file_id == "file-out"
+        return SimpleNamespace(text=self.output)
+
+    def _batch(self, status: str):
+        return SimpleNamespace(id="batch_1", status=status, output_file_id="file-out")
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert input_file_id == "file-in"
+        return self._batch("validating")
+
+    def _retrieve(self, batch_id):
+        self.retrieved += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return self._batch(status)
+
+    def _cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Batch polling without waiting."""
+    monkeypatch.setattr(filing_parser.time, "sleep", lambda seconds: None)
+
+
+class TestBatchRequests:
+    """Test Batch API request records."""
+
+    def test_batch_requests_format(self):
+        """Test records carry the accession id and the strict FinancialMetric schema."""
+        records = build_batch_requests(FILINGS)
+
+        assert [r["custom_id"] for r in records] == list(FILINGS)
+        for record in records:
+            assert record["method"] == "POST"
+            assert record["url"] == "/v1/chat/completions"
+            schema = record["body"]["response_format"]["json_schema"]
+            assert schema["strict"] is True
+            assert schema["schema"]["additionalProperties"] is False
+            assert set(schema["schema"]["required"]) == {"revenue", "net_income"}
+            json.dumps(record)  # each record must serialize to one JSONL line
+
+    def test_unknown_mode(self):
+        """Test an unknown mode is rejected before any request is made."""
+        with pytest.raises(ValueError):
+            parse_filings(None, {}, mode="stream")
+
+
+class TestBatchParsing:
+    """Test the Batch API polling path."""
+
+    def test_batch_completes(self):
+        """Test in-progress batches are polled until completed and failed requests are dropped."""
+        ok, failed = FILINGS
+        output = "\n".join([_output_line(ok, revenue=394.3e9), _output_line(failed, status_code=500)])
+        client = FakeBatchClient(["in_progress", "finalizing", "completed"], output)
+
+        results = parse_filings(client, FILINGS, mode="batch", poll_seconds=0)
+
+        assert [r["custom_id"] for r in client.uploaded] == list(FILINGS)
+        assert client.retrieved == 3
+        assert results == {ok: FinancialMetric(revenue=394.3e9, net_income=394.3e9 / 4)}
+
+    @pytest.mark.parametrize("status", ["failed", "expired", "cancelled"])
+    def test_batch_not_completed_raises(self, status):
+        """Test a batch ending in any other terminal status raises DataFetchError."""
+        client = FakeBatchClient(["in_progress", status])
+
+        with pytest.raises(DataFetchError, match=status) as excinfo:
+            parse_filings(client, FILINGS, mode="batch", poll_seconds=0)
+        assert excinfo.value.details == {"source": "openai", "batch_id": "batch_1", "status": status}
+        assert client.cancelled == []
+
+    def test_batch_timeout_cancels(self):
+        """Test a batch stuck past the deadline is cancelled and raises instead of polling forever."""
+        client = FakeBatchClient(["in_progress"])
+
+        with pytest.raises(DataFetchError, match="cancelled"):
+            parse_filings(client, FILINGS, mode="batch", poll_seconds=0, timeout=0.05)
+        assert client.cancelled == ["batch_1"]
+        assert client.retrieved > 0
@@ -0,0 +1,500 @@
+"""Unit tests for relative valuation (no API calls)."""
+
+import io
+import json
+import math
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.relative_valuation import (
+    PEER_MULTIPLES_TTL_SECONDS,
+    RelativeMetrics,
+    RelativeValuationEngine,
+    _premium_score_numpy,
+    analyze_many,
+    calculate_implied_fair_value,
+    calculate_implied_fair_value_batch,
+    calculate_relative_scores_batch,
+    classify_relative_batch,
+    clear_peer_multiples_cache,
+    get_all_sector_multiples,
+    get_live_peer_multiples,
+    reload_peg_thresholds,
+    write_metrics_ndjson,
+)
+
+
+class TestRelativeMetrics:
+    """Test RelativeMetrics serialization."""
+
+    def test_to_json_matches_to_dict(self):
+        """Test to_json() encodes exactly the to_dict() payload."""
+        metrics = RelativeMetrics(
+            ticker="AAPL",
+            sector="Technology",
+            forward_pe=28.456,
+            peer_pe_range=(20.0, 35.5),
+            pe_premium=1.66,
+            relative_score=49.17,
+        )
+        assert json.loads(metrics.to_json()) == metrics.to_dict()
+
+    def test_write_metrics_ndjson(self):
+        """Test one to_dict() payload per line, in order."""
+        metrics = [
+            RelativeMetrics(ticker="AAA", sector="Technology", forward_pe=20.0),
+            RelativeMetrics(ticker="BBB", sector=None, peer_pe_range=(1.0, 2.0)),
+        ]
+        buffer = io.BytesIO()
+        assert write_metrics_ndjson(iter(metrics), buffer) == 2
+
+        lines = buffer.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == [m.to_dict() for m in metrics]
+
+    def test_frozen_and_hashable(self):
+        """Test instances are immutable and usable as cache keys."""
+        metrics = RelativeMetrics(ticker="AAPL", sector="Technology", peer_pe_range=(20.0, 35.5))
+        with pytest.raises(AttributeError):
+            metrics.forward_pe = 10.0
+        assert {metrics: 1}[RelativeMetrics(ticker="AAPL", sector="Technology", peer_pe_range=(20.0, 35.5))] == 1
+
+    def test_to_dict_layout(self):
+        """Test to_dict() nesting, key order, rounding and falsy -> None."""
+        metrics = RelativeMetrics(
+            ticker="AAPL",
+            sector="Technology",
+            forward_pe=28.456,
+            trailing_pe=31.0,
+            pb_ratio=0.0,
+            ev_ebitda=22.123,
+            peg_ratio=1.234,
+            sector_median_pe=28.0,
+            sector_median_pb=8.0,
+            sector_median_ev_ebitda=22.0,
+            peer_count=14,
+            peer_pe_range=(12.345, 55.555),
+            peer_ev_range=(8.0, 40.129),
+            pe_premium=1.6285,
+            ev_ebitda_premium=0.559,
+            pe_signal="FAIRLY VALUED",
+            ev_ebitda_signal="FAIRLY VALUED",
+            peg_signal="FAIRLY VALUED",
+            relative_score=49.45,
+            overall_signal="FAIRLY VALUED",
+        )
+        result = metrics.to_dict()
+
+        assert list(result) == [
+            "ticker", "sector", "multiples", "sector_benchmarks",
+            "peer_ranges", "premiums", "signals", "relative_score",
+        ]
+        assert result["multiples"] == {
+            "forward_pe": 28.46, "trailing_pe": 31.0, "pb_ratio": None,
+            "ev_ebitda": 22.12, "peg_ratio": 1.23,
+        }
+        assert result["sector_benchmarks"] == {
+            "median_pe": 28.0, "median_pb": 8.0, "median_ev_ebitda": 22.0, "peer_count": 14,
+        }
+        assert result["peer_ranges"] == {"pe_range": [12.35, 55.55], "pb_range": None, "ev_range": [8.0, 40.13]}
+        assert result["premiums"] == {"pe_premium": 1.6, "pb_premium": None, "ev_ebitda_premium": 0.6}
+        assert result["signals"] == {
+            "pe_signal": "FAIRLY VALUED", "pb_signal": "N/A", "ev_ebitda_signal": "FAIRLY VALUED",
+            "peg_signal": "FAIRLY VALUED", "overall_signal": "FAIRLY VALUED",
+        }
+        assert result["relative_score"] == 49.5
+
+
+class TestRelativeValuationEngine:
+    """Test RelativeValuationEngine.analyze() with static benchmarks."""
+
+    def test_analyze_without_usable_multiples(self, monkeypatch):
+        """Test no peer fetch happens and signals stay N/A when no multiple is usable."""
+        def fail_fetch(*args, **kwargs):
+            raise AssertionError("peer multiples should not be fetched")
+
+        monkeypatch.setattr("src.relative_valuation.get_live_peer_multiples", fail_fetch)
+
+        metrics = RelativeValuationEngine("THIN", "Technology").analyze(
+            forward_pe=None, trailing_pe=12.0, pb_ratio=-1.0, ev_ebitda=None, peg_ratio=0.8,
+        )
+        assert metrics.trailing_pe == 12.0
+        assert metrics.relative_score is None
+        assert metrics.overall_signal == "N/A"
+        assert metrics.pe_signal == "N/A"
+        assert metrics.peg_signal == "UNDERVALUED"
+        assert metrics.sector_median_pe is None
+
+    def test_prefetched_peers_used_by_analyze(self, monkeypatch):
+        """Test analyze() uses peer stats fetched in the background at construction."""
+        calls = []
+
+        def fetch(sector, exclude_ticker=None):
+            calls.append((sector, exclude_ticker))
+            return {"median_pe": 40.0, "median_pb": None, "median_ev_ebitda": None, "peer_count": 7}
+
+        monkeypatch.setattr("src.relative_valuation.get_live_peer_multiples", fetch)
+
+        engine = RelativeValuationEngine("AAA", "Technology", prefetch_peers=True)
+        metrics = engine.analyze(forward_pe=20.0, trailing_pe=None, pb_ratio=None, ev_ebitda=None)
+
+        assert calls == [("Technology", "AAA")]
+        assert metrics.sector_median_pe == 40.0
+        assert metrics.peer_count == 7
+
+    def test_import_starts_no_prefetch_pool(self):
+        """Test the peer-prefetch pool is created by the first prefetch, not by importing."""
+        code = (
+            "import src.relative_valuation as rv\n"
+            "assert rv._PREFETCH_EXECUTOR is None\n"
+            "rv.RelativeValuationEngine('AAA', 'Technology')\n"
+            "assert rv._PREFETCH_EXECUTOR is None\n"
+            "assert rv._get_prefetch_executor() is rv._get_prefetch_executor()\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1])
+
+    def test_prefetch_timeout_falls_back_to_static(self, monkeypatch):
+        """Test a hung peer prefetch gives static benchmarks instead of blocking analyze()."""
+        release = threading.Event()
+
+        def hang(sector, exclude_ticker=None):
+            release.wait(5)
+            return {"median_pe": 40.0, "peer_count": 7}
+
+        monkeypatch.setattr("src.relative_valuation.get_live_peer_multiples", hang)
+        monkeypatch.setattr("src.relative_valuation.PEER_PREFETCH_TIMEOUT", 0.05)
+
+        engine = RelativeValuationEngine("AAA", "Technology", prefetch_peers=True)
+        try:
+            metrics = engine.analyze(forward_pe=20.0, trailing_pe=None, pb_ratio=None, ev_ebitda=None)
+        finally:
+            release.set()
+
+        assert metrics.sector_median_pe == 28.0
+        assert metrics.peer_count is None
+
+
+class TestLivePeerMultiples:
+    """Test live peer multiple aggregation (fetch mocked)."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_memo(self):
+        clear_peer_multiples_cache()
+        yield
+        clear_peer_multiples_cache()
+
+    def test_peer_multiples_from_info_only(self, monkeypatch, tmp_cache):
+        """Test peers only need info fields and unusable values are skipped."""
+        infos = {
+            "AAA": {"forwardPE": 20.0, "priceToBook": 4.0, "enterpriseToEbitda": 12.0},
+            "BBB": {"forwardPE": 30.0, "priceToBook": -2.0, "enterpriseToEbitda": "Infinity"},
+            "CCC": None,
+        }
+        monkeypatch.setattr("src.relative_valuation.SECTOR_PEERS", {"Testing": list(infos)})
+        monkeypatch.setattr("src.relative_valuation.default_cache", tmp_cache)
+        monkeypatch.setattr(
+            "src.dcf_engine.DCFEngine.fetch_batch_info", staticmethod(lambda tickers: infos)
+        )
+
+        result = get_live_peer_multiples("Testing")
+        assert result["median_pe"] == 25.0
+        assert result["pe_range"] == (20.0, 30.0)
+        assert result["median_pb"] == 4.0
+        assert result["median_ev_ebitda"] == 12.0
+        assert result["peer_count"] == 3
+        assert result["source"] == "live_peers"
+
+    def test_repeat_lookups_memoized(self, monkeypatch, tmp_cache):
+        """Test repeat lookups skip the fetch and return independent dicts."""
+        calls = []
+
+        def fetch(tickers):
+            calls.append(tickers)
+            return {t: {"forwardPE": 10.0} for t in tickers}
+
+        monkeypatch.setattr("src.relative_valuation.SECTOR_PEERS", {"Testing": ["AAA", "BBB"]})
+        monkeypatch.setattr("src.relative_valuation.default_cache", tmp_cache)
+        monkeypatch.setattr("src.dcf_engine.DCFEngine.fetch_batch_info", staticmethod(fetch))
+
+        first = get_live_peer_multiples("Testing")
+        first["median_pe"] = None
+        second = get_live_peer_multiples("Testing")
+
+        assert len(calls) == 1
+        assert second["median_pe"] == 10.0
+
+    def test_memo_expires_with_ttl(self, monkeypatch, tmp_cache):
+        """Test memoized results are refetched once the TTL window passes."""
+        calls = []
+        now = [1000.0]
+
+        def fetch(tickers):
+            calls.append(tickers)
+            return {t: {"forwardPE": 10.0 + len(calls)} for t in tickers}
+
+        monkeypatch.setattr("src.relative_valuation.SECTOR_PEERS", {"Testing": ["AAA"]})
+        monkeypatch.setattr("src.relative_valuation.default_cache", tmp_cache)
+        monkeypatch.setattr("src.dcf_engine.DCFEngine.fetch_batch_info", staticmethod(fetch))
+        monkeypatch.setattr("src.relative_valuation.time.monotonic", lambda: now[0])
+
+        assert get_live_peer_multiples("Testing")["median_pe"] == 11.0
+        # Without the disk entry, only the memo can serve repeats
+        tmp_cache.invalidate("peer_multiples_Testing_all")
+        now[0] += 60
+        assert get_live_peer_multiples("Testing")["median_pe"] == 11.0
+        now[0] += PEER_MULTIPLES_TTL_SECONDS
+        assert get_live_peer_multiples("Testing")["median_pe"] == 12.0
+        assert len(calls) == 2
+
+    def test_failed_fetch_not_memoized(self, monkeypatch, tmp_cache):
+        """Test a fetch with no usable multiple is retried rather than cached."""
+        responses = [{}, {"AAA": {"forwardPE": 10.0}}]
+        monkeypatch.setattr("src.relative_valuation.SECTOR_PEERS", {"Testing": ["AAA"]})
+        monkeypatch.setattr("src.relative_valuation.default_cache", tmp_cache)
+        monkeypatch.setattr(
+            "src.dcf_engine.DCFEngine.fetch_batch_info", staticmethod(lambda tickers: responses.pop(0))
+        )
+
+        failed = get_live_peer_multiples("Testing")
+        assert failed["median_pe"] is None
+        assert failed["peer_count"] == 1
+        tmp_cache.flush()
+        assert tmp_cache.get("peer_multiples_Testing_all") is None
+
+        assert get_live_peer_multiples("Testing")["median_pe"] == 10.0
+
+    def test_disk_cache_restores_ranges(self, monkeypatch, tmp_cache):
+        """Test results reloaded from the disk cache keep tuple ranges."""
+        monkeypatch.setattr("src.relative_valuation.SECTOR_PEERS", {"Testing": ["AAA", "BBB"]})
+        monkeypatch.setattr("src.relative_valuation.default_cache", tmp_cache)
+        monkeypatch.setattr(
+            "src.dcf_engine.DCFEngine.fetch_batch_info",
+            staticmethod(lambda tickers: {t: {"forwardPE": 10.0} for t in tickers}),
+        )
+
+        fresh = get_live_peer_multiples("Testing")
+        tmp_cache.flush()
+        clear_peer_multiples_cache()
+        monkeypatch.setattr("src.dcf_engine.DCFEngine.fetch_batch_info", staticmethod(lambda tickers: {}))
+
+        assert get_live_peer_multiples("Testing") == fresh
+        assert fresh["pe_range"] == (10.0, 10.0)
+
+    def test_all_sector_multiples(self, monkeypatch):
+        """Test every sector is fetched and keyed in input order."""
+        monkeypatch.setattr(
+            "src.relative_valuation.get_live_peer_multiples",
+            lambda sector: {"median_pe": float(len(sector))},
+        )
+        result = get_all_sector_multiples(["Energy", "Technology", "Utilities"], max_workers=3)
+        assert list(result) == ["Energy", "Technology", "Utilities"]
+        assert result["Technology"]["median_pe"] == 10.0
+
+    def test_all_sector_multiples_accepts_generator(self, monkeypatch):
+        """Test a one-shot iterable of sectors is not consumed before zipping."""
+        monkeypatch.setattr(
+            "src.relative_valuation.get_live_peer_multiples",
+            lambda sector: {"median_pe": float(len(sector))},
+        )
+        result = get_all_sector_multiples(s for s in ("Energy", "Utilities"))
+        assert result == {"Energy": {"median_pe": 6.0}, "Utilities": {"median_pe": 9.0}}
+        assert get_all_sector_multiples([]) == {}
+
+
+class TestRelativeScore:
+    """Test the scalar composite score."""
+
+    def test_score_clamped_as_float(self):
+        """Test clamped scores stay floats and no premiums gives None."""
+        engine = RelativeValuationEngine("TEST", "Technology")
+        assert engine._calculate_relative_score(None, None, None) is None
+        assert engine._calculate_relative_score(-30.0, None, None) == 65.0
+        high = engine._calculate_relative_score(500.0, 300.0, None)
+        assert high == 0.0 and isinstance(high, float)
+
+
+@pytest.mark.usefixtures("warm_kernels")
+class TestAnalyzeBatch:
+    """Test the DataFrame batch analysis against per-ticker analyze()."""
+
+    def test_analyze_batch_matches_analyze(self):
+        """Test every row agrees with analyze(use_live_peers=False)."""
+        df = pd.DataFrame(
+            {
+                "sector": ["Technology", "Energy", None, "Unknown Sector", "Technology"],
+                "forward_pe": [20.0, 14.0, None, 40.0, None],
+                "pb_ratio": [5.0, -1.0, None, 2.0, -3.0],
+                "ev_ebitda": [15.0, None, 30.0, 0.0, None],
+                "peg": [0.8, None, 2.5, -1.0, 1.2],
+            },
+            index=["AAA", "BBB", "CCC", "DDD", "EEE"],
+        )
+        result = RelativeValuationEngine.analyze_batch(df, peg_col="peg")
+
+        assert list(result.index) == list(df.index)
+        for ticker, row in df.iterrows():
+            sector = row["sector"]
+            expected = RelativeValuationEngine(ticker, sector).analyze(
+                forward_pe=None if pd.isna(row["forward_pe"]) else row["forward_pe"],
+                trailing_pe=None,
+                pb_ratio=None if pd.isna(row["pb_ratio"]) else row["pb_ratio"],
+                ev_ebitda=None if pd.isna(row["ev_ebitda"]) else row["ev_ebitda"],
+                peg_ratio=None if pd.isna(row["peg"]) else row["peg"],
+                use_live_peers=False,
+            )
+            got = result.loc[ticker]
+            for key in ("pe_signal", "pb_signal", "ev_ebitda_signal", "peg_signal", "overall_signal"):
+                assert got[key] == getattr(expected, key)
+            for key in ("sector_median_pe", "sector_median_pb", "sector_median_ev_ebitda",
+                        "pe_premium", "pb_premium", "ev_ebitda_premium", "relative_score"):
+                if getattr(expected, key) is None:
+                    assert np.isnan(got[key])
+                else:
+                    assert got[key] == pytest.approx(getattr(expected, key))
+
+
+class TestAnalyzeMany:
+    """Test concurrent multi-ticker analysis (static benchmarks only)."""
+
+    def test_analyze_many_preserves_order(self):
+        """Test results line up with inputs and match single-ticker analyze()."""
+        inputs = [
+            ("AAA", "Technology", {"forward_pe": 20.0, "trailing_pe": 22.0, "pb_ratio": 5.0,
+                                   "ev_ebitda": 15.0, "use_live_peers": False}),
+            ("BBB", "Energy", {"forward_pe": 14.0, "trailing_pe": None, "pb_ratio": 2.5,
+                               "ev_ebitda": None, "use_live_peers": False}),
+            ("CCC", None, {"forward_pe": None, "trailing_pe": None, "pb_ratio": None,
+                           "ev_ebitda": 30.0, "use_live_peers": False}),
+        ]
+        results = analyze_many(inputs, max_workers=3)
+
+        assert [m.ticker for m in results] == ["AAA", "BBB", "CCC"]
+        for (ticker, sector, kwargs), metrics in zip(inputs, results, strict=True):
+            expected = RelativeValuationEngine(ticker, sector).analyze(**kwargs)
+            assert metrics == expected
+
+
+@pytest.mark.usefixtures("warm_kernels")
+class TestRelativeScoresBatch:
+    """Test the batch premium/score kernel."""
+
+    MULTIPLES = np.array([
+        [20.0, 5.0, 15.0],
+        [np.nan, -1.0, 0.0],
+        [40.0, np.nan, 30.0],
+    ])
+    BENCHMARKS = np.array([28.0, 8.0, 22.0])
+
+    def test_batch_matches_engine(self):
+        """Test batch premiums/scores equal the per-ticker engine methods."""
+        premiums, scores = calculate_relative_scores_batch(self.MULTIPLES, self.BENCHMARKS)
+        engine = RelativeValuationEngine("TEST", "Technology")
+
+        for i, row in enumerate(self.MULTIPLES):
+            expected = [
+                engine._calculate_premium(None if np.isnan(v) else float(v), b)
+                for v, b in zip(row, self.BENCHMARKS, strict=True)
+            ]
+            for j, value in enumerate(expected):
+                if value is None:
+                    assert np.isnan(premiums[i, j])
+                else:
+                    assert premiums[i, j] == pytest.approx(value)
+
+            score = engine._calculate_relative_score(*expected)
+            if score is None:
+                assert np.isnan(scores[i])
+            else:
+                assert scores[i] == pytest.approx(score)
+
+    def test_kernel_matches_numpy_reference(self):
+        """Test the active kernel (numba when installed) matches the NumPy path."""
+        benchmarks = np.broadcast_to(self.BENCHMARKS, self.MULTIPLES.shape)
+        ref_premiums, ref_scores = _premium_score_numpy(self.MULTIPLES, benchmarks)
+        premiums, scores = calculate_relative_scores_batch(self.MULTIPLES, self.BENCHMARKS)
+        np.testing.assert_allclose(premiums, ref_premiums, equal_nan=True)
+        np.testing.assert_allclose(scores, ref_scores, equal_nan=True)
+
+
+class TestClassifyBatch:
+    """Test batch signal classification against the scalar classifiers."""
+
+    def test_batch_matches_engine(self):
+        """Test every threshold boundary classifies the same as the engine."""
+        engine = RelativeValuationEngine("TEST", "Technology")
+        premium_values = [-45.0, -30.0, -20.0, -15.0, 0.0, 15.0, 20.0, 30.0, 60.0, np.nan]
+        premiums = np.column_stack([premium_values] * 3)
+        scores = np.array([0.0, 44.9, 45.0, 50.0, 64.9, 65.0, 100.0, np.nan, 30.0, 70.0])
+        pegs = np.array([-1.0, 0.0, 0.3, 0.5, 0.9, 1.0, 1.5, 2.0, 3.0, np.nan])
+
+        signals = classify_relative_batch(premiums, scores, pegs)
+
+        for i in range(len(premium_values)):
+            premium = None if np.isnan(premiums[i, 0]) else float(premiums[i, 0])
+            score = None if np.isnan(scores[i]) else float(scores[i])
+            peg = None if np.isnan(pegs[i]) else float(pegs[i])
+            assert signals["pe_signal"][i] == engine._classify_multiple(premium, "P/E")
+            assert signals["ev_ebitda_signal"][i] == engine._classify_multiple(premium, "EV/EBITDA")
+            assert signals["overall_signal"][i] == engine._classify_overall(score)
+            assert signals["peg_signal"][i] == engine._classify_peg(peg)
+
+    def test_reload_peg_thresholds(self, monkeypatch):
+        """Test PEG thresholds are snapshotted until explicitly reloaded."""
+        engine = RelativeValuationEngine("TEST", "Technology")
+        assert engine._classify_peg(1.2) == "FAIRLY VALUED"
+
+        monkeypatch.setattr("src.relative_valuation.config.PEG_FAIR_MAX", 1.1)
+        assert engine._classify_peg(1.2) == "FAIRLY VALUED"
+        reload_peg_thresholds()
+        try:
+            assert engine._classify_peg(1.2) == "MODERATELY EXPENSIVE"
+        finally:
+            monkeypatch.undo()
+            reload_peg_thresholds()
+
+    def test_signals_stored_as_int8_codes(self):
+        """Test batch signals are categorical with compact integer codes."""
+        signals = classify_relative_batch(np.array([[-40.0, 0.0, np.nan]]), np.array([70.0]))
+        assert signals["pe_signal"].codes.dtype == np.int8
+        assert list(signals["pe_signal"].categories)[-1] == "N/A"
+        assert [signals[k][0] for k in ("pe_signal", "pb_signal", "ev_ebitda_signal", "overall_signal")] == [
+            "VERY CHEAP", "FAIRLY VALUED", "N/A", "UNDERVALUED",
+        ]
+
+
+class TestImpliedFairValue:
+    """Test scalar and batch implied fair value calculations."""
+
+    def test_batch_matches_scalar(self):
+        """Test batch results agree with the scalar function per ticker."""
+        rows = [
+            (100.0, 20.0, 2.0, 10.0),
+            (50.0, None, 4.0, 8.0),
+            (75.0, 15.0, 0.0, None),
+        ]
+        batch = calculate_implied_fair_value_batch(
+            [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], [r[3] for r in rows],
+            25.0, 3.0, 12.0,
+        )
+
+        for i, (price, pe, pb, ev) in enumerate(rows):
+            scalar = calculate_implied_fair_value(price, pe, 25.0, pb, 3.0, ev, 12.0)
+            for key in ("pe_implied", "pb_implied", "ev_ebitda_implied", "average_implied"):
+                if key in scalar:
+                    assert batch[key][i] == pytest.approx(scalar[key])
+                else:
+                    assert math.isnan(batch[key][i])
+
+    def test_batch_no_valid_multiples(self):
+        """Test rows without any usable multiple average to NaN."""
+        batch = calculate_implied_fair_value_batch([50.0], [None], [-1.0], [float("nan")], 25.0, 3.0, 12.0)
+        assert math.isnan(batch["average_implied"][0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
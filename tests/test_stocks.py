@@ -18,9 +18,6 @@ Run with: uv run python test_stocks.py
 import os
 import sys
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 print("\n" + "=" * 80)
 print("MID-CAP S&P 500 STOCK VALUATION TEST")
 print("=" * 80 + "\n")
@@ -75,6 +72,10 @@ print("-" * 80)
 print("Fetching External Market Data")
 print("-" * 80)
 
+# Fetched once here and handed to every engine below
+macro_data = None
+cape_data = None
+
 try:
     # FRED data
     fred = get_fred_connector()
@@ -103,23 +104,21 @@ print("Running DCF Valuations")
 print("-" * 80)
 print()
 
-results = {}
-
-for ticker, name in test_stocks.items():
+def value_one(ticker: str, name: str, data) -> dict | None:
+    """Value one stock from pre-fetched company data and print its report (None on failure)."""
     print(f"📊 Valuing {ticker} ({name})")
     print("   " + "-" * 76)
     
+    if data is None:
+        print(f"   ❌ Failed to fetch data")
+        print()
+        return None
+    
     try:
-        # Initialize DCF engine
-        engine = DCFEngine(ticker=ticker, auto_fetch=True)
+        # Initialize DCF engine on the pre-fetched data
+        engine = DCFEngine(ticker=ticker, auto_fetch=False, macro_data=macro_data, cape_data=cape_data)
+        engine._company_data = data
         
-        if not engine.is_ready:
-            print(f"   ❌ Failed to fetch data: {engine.last_error}")
-            print()
-            continue
-        
-        # Get company data
-        data = engine.company_data
         sector = data.sector if data.sector else 'Unknown'
         
         print(f"   • Sector: {sector}")
@@ -171,7 +170,7 @@ for ticker, name in test_stocks.items():
         print(f"      Conviction:       {conviction}")
         print()
         
-        results[ticker] = {
+        return {
             'name': name,
             'sector': sector,
             'current_price': current_price,
@@ -186,7 +185,19 @@ for ticker, name in test_stocks.items():
         import traceback
         traceback.print_exc()
         print()
-        continue
+        return None
+
+
+# Fetch every stock concurrently (network-bound); the Monte Carlo runs
+# themselves are vectorized and take milliseconds, so they stay serial
+company_data = DCFEngine.fetch_batch_data(list(test_stocks), show_progress=False)
+
+results = {}
+
+for ticker, name in test_stocks.items():
+    result = value_one(ticker, name, company_data.get(ticker))
+    if result is not None:
+        results[ticker] = result
 
 # Summary
 print("=" * 80)
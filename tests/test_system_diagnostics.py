@@ -18,10 +18,13 @@ from dataclasses import dataclass
 from datetime import datetime
 
 import numpy as np
+import pytest
 
 from src.dcf_engine import DCFEngine
 from src.logging_config import get_logger
 
+pytestmark = pytest.mark.network
+
 logger = get_logger(__name__)
 
 
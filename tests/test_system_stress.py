@@ -27,6 +27,8 @@ from src.config import SECTOR_PEERS
 from src.dcf_engine import DCFEngine
 from src.exceptions import ValidationError
 
+pytestmark = pytest.mark.network
+
 
 # Select 3-4 stocks per sector for comprehensive coverage
 # Prioritize: diverse market caps, different growth profiles, data quality variation
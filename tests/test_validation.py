@@ -218,6 +218,26 @@ class TestTickerValidation:
         with pytest.raises(ValueError):
             TickerInput(symbol="")
 
+    def test_models_are_frozen(self):
+        """Test validated models reject mutation after construction."""
+        ticker = TickerInput(symbol="aapl")
+        with pytest.raises(ValueError):
+            ticker.symbol = "msft"
+        assert hash(ticker) == hash(TickerInput(symbol="AAPL"))
+
+    def test_trusted_ticker_matches_validated(self):
+        """Test the trusted fast path normalizes like full validation."""
+        for symbol in validate_tickers(["aapl", "brk.b"]):
+            assert TickerInput.trusted(symbol) == TickerInput(symbol=symbol)
+        assert TickerInput.trusted(" msft ").symbol == "MSFT"
+
+    def test_invalid_characters_rejected(self):
+        """Test symbols with characters outside letters, digits, '.' and '-' are rejected."""
+        for symbol in ["BR$.B", "AA PL", "MSFT!"]:
+            with pytest.raises(ValueError):
+                TickerInput(symbol=symbol)
+        assert TickerInput(symbol="bf-b").symbol == "BF-B"
+
     def test_validate_ticker_function(self):
         """Test validate_ticker utility function."""
         assert validate_ticker("aapl") == "AAPL"
@@ -254,6 +274,35 @@ class TestMultiTickerValidation:
         assert tickers.symbols == ["AAPL"]
 
 
+    def test_invalid_ticker_in_list_rejected(self):
+        """Test every symbol in the list is checked, not just normalized."""
+        with pytest.raises(ValueError):
+            MultiTickerInput(symbols=["AAPL", "MS FT"])
+
+
+class TestCompanyDataInputValidation:
+    """Test CompanyDataInput normalization."""
+
+    BASE = {"ticker": "AAPL", "fcf": 100.0, "shares": 10.0, "current_price": 150.0, "market_cap": 2.0}
+
+    def test_zero_beta_defaults(self):
+        """Test a zero beta is replaced with 1.0."""
+        assert CompanyDataInput(**self.BASE, beta=0).beta == 1.0
+        assert CompanyDataInput(**self.BASE, beta=1.3).beta == 1.3
+
+    def test_growth_capped(self):
+        """Test growth estimates above +100% are capped."""
+        assert CompanyDataInput(**self.BASE, analyst_growth=1.5).analyst_growth == 1.0
+        assert CompanyDataInput(**self.BASE, analyst_growth=-0.2).analyst_growth == -0.2
+
+    def test_out_of_bounds_still_rejected(self):
+        """Test values outside the field bounds are rejected, not normalized."""
+        with pytest.raises(ValueError):
+            CompanyDataInput(**self.BASE, beta=6.0)
+        with pytest.raises(ValueError):
+            CompanyDataInput(**self.BASE, analyst_growth=3.0)
+
+
 class TestPortfolioParamsValidation:
     """Test PortfolioParams validation."""
 
@@ -211,6 +211,7 @@ class XBRLDirectParser:
         return combined
 
 
+@pytest.mark.network
 class TestXBRLDirectParsing:
     """Test direct XBRL parsing without LLM."""
 
@@ -356,6 +357,7 @@ class TestXBRLDirectParsing:
             print("⚠️  FCF not available (missing OCF or CapEx)")
 
 
+@pytest.mark.network
 class TestXBRLVsYFinanceComparison:
     """Compare XBRL data quality vs yfinance."""
 
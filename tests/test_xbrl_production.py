@@ -7,17 +7,13 @@ to validate robustness across different companies and industries.
 
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-
 import pandas as pd
 import pytest
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.external.xbrl_parser import XBRLDirectParser
 
+pytestmark = pytest.mark.network
+
 # Mid-cap S&P 500 stocks (approximate ranks 41-50)
 # Selected to avoid top-tier AAPL/MSFT/GOOGL but ensure data availability
 TEST_TICKERS = [